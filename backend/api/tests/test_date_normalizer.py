@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from api.utils.date_normalizer import normalize_date_text, normalize_series
+
+
+class NormalizeDateTextTests(TestCase):
+    def test_cjk_output_format_counts_each_date_once(self):
+        self.assertEqual(normalize_date_text("2024-05-01", out_fmt="YYYY年MM月DD日"), ("2024年05月01日", 1))
+        self.assertEqual(
+            normalize_date_text("2024年5月1日 and 2024-05-02", out_fmt="YYYY年MM月DD日"),
+            ("2024年05月01日 and 2024年05月02日", 2),
+        )
+
+    def test_cjk_input(self):
+        self.assertEqual(normalize_date_text("met 2024年5月1日"), ("met 2024-05-01", 1))
+
+    def test_ascii_shapes(self):
+        self.assertEqual(normalize_date_text("20240501 and 2024/5/1", dayfirst=False), ("2024-05-01 and 2024-05-01", 2))
+        self.assertEqual(normalize_date_text("no dates here"), ("no dates here", 0))
+
+    def test_full_width_digits(self):
+        self.assertEqual(normalize_date_text("２０２４-０５-０１"), ("2024-05-01", 1))
+        self.assertEqual(normalize_date_text("on ２０２４/５/１ ok", dayfirst=False), ("on 2024-05-01 ok", 1))
+        # Adjacent digits of either width still block a match
+        self.assertEqual(normalize_date_text("１２０２４-05-01"), ("１２０２４-05-01", 0))
+
+    def test_dayfirst_year_first_tokens(self):
+        self.assertEqual(normalize_date_text("on 2024/5/1", dayfirst=True), ("on 2024-01-05", 1))
+        self.assertEqual(normalize_date_text("on 2024/5/13", dayfirst=True), ("on 2024-05-13", 1))
+        self.assertEqual(normalize_date_text("on 2024/13/1", dayfirst=False), ("on 2024-01-13", 1))
+
+
+class NormalizeSeriesTests(TestCase):
+    """The executor hands normalize_series string columns; numeric-looking text is not an Excel serial."""
+
+    def test_string_column(self):
+        ser = pd.Series(["45413", "01.05.2024", "", "abc", None, "45413"], dtype="string")
+        out, n = normalize_series(ser, dayfirst=True)
+        self.assertEqual(out.tolist()[:5], ["45413", "2024-05-01", "", "abc", pd.NA])
+        self.assertEqual(out.iloc[5], "45413")
+        self.assertEqual(n, 1)
+
+    def test_dayfirst_reads_year_first_as_ydm(self):
+        # Pinned to the original parser chain (dateparser DATE_ORDER=DMY / dateutil dayfirst)
+        ser = pd.Series(["2024-05-01 10:20:30", "2024/05/13", "13/05/2024", "2024.13.01"], dtype="string")
+        out, n = normalize_series(ser, dayfirst=True)
+        self.assertEqual(out.tolist(), ["2024-01-05", "2024-05-13", "2024-05-13", "2024-01-13"])
+        self.assertEqual(n, 4)
+        self.assertEqual(normalize_series(ser, dayfirst=False)[0].tolist(), ["2024-05-01", "2024-05-13", "2024-05-13", "2024-01-13"])
@@ -0,0 +1,129 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from api.utils.regex_executor import _ensure_mask_from_query, _mask_from_clauses
+
+
+def _rows(mask) -> list:
+    return [bool(v) for v in mask]
+
+
+class UserRegexClauseTests(TestCase):
+    """User .str.* regexes keep Python `re` semantics whatever string backend is active."""
+
+    def setUp(self):
+        self.df = pd.DataFrame({"name": ["café", "Alpha\n", "x"]})
+
+    def test_unicode_word_class(self):
+        q = r"`name`.str.contains('caf\w', case=False)"
+        self.assertEqual(_rows(_mask_from_clauses(self.df, q)), [True, False, False])
+        self.assertEqual(_rows(_ensure_mask_from_query(self.df, q)), [True, False, False])
+
+    def test_dollar_matches_before_trailing_newline(self):
+        q = "`name`.str.contains('^alpha$', case=False)"
+        self.assertEqual(_rows(_mask_from_clauses(self.df, q)), [False, True, False])
+        self.assertEqual(_rows(_ensure_mask_from_query(self.df, q)), [False, True, False])
+
+    def test_turkish_i_case_insensitive(self):
+        # re.I folds i/I with İ/ı; RE2's ignore_case does not
+        df = pd.DataFrame({"city": ["İstanbul", "Izmir", "Diyarbakır", "Paris"]})
+        cases = {
+            "`city`.str.contains('istanbul', case=False)": [True, False, False, False],
+            "`city`.str.contains('IR', case=False)": [False, True, True, False],
+            "`city`.str.contains('[h-j]', case=False)": [True, True, True, True],
+        }
+        for q, expected in cases.items():
+            with self.subTest(q=q):
+                self.assertEqual(_rows(_mask_from_clauses(df, q)), expected)
+                self.assertEqual(_rows(_ensure_mask_from_query(df, q)), expected)
+
+    def test_unicode_digits(self):
+        df = pd.DataFrame({"code": ["A٣", "A3", "AB"]})
+        q = r"`code`.str.contains('A\d', case=True)"
+        self.assertEqual(_rows(_mask_from_clauses(df, q)), [True, True, False])
+
+
+class SimpleAndFastPathTests(TestCase):
+    """The clauses_direct fast path must agree with df.query on the shapes it accepts."""
+
+    def test_matches_df_query(self):
+        from api.utils.regex_executor import _is_simple_and_expr
+
+        df = pd.DataFrame({
+            "name": ["café", "Alpha\n", "x", "CAFE", "straße", "İstanbul", "Diyarbakır"],
+            "code": ["A٣", "A3", "AB", "b7", "s1", "i9", "D2"],
+            "units": [5, 150, 20, 900, 0, 40, 60],
+        })
+        queries = [
+            r"`name`.str.contains('caf\w', case=False)",
+            "`name`.str.contains('^alpha$', case=False)",
+            "`name`.str.match('ca', case=True) & `units` > 3",
+            "`name`.str.fullmatch('stra(ss|ß)e', case=False)",
+            r"`code`.str.contains('\d', case=True) and `units` <= 150",
+            "`name`.astype('string').str.contains('A', case=False, na=False) & `units` >= 20",
+            "`name`.str.contains('istanbul', case=False)",
+            "`name`.str.contains('IR', case=False) & `units` > 10",
+            "`code`.str.match('[a-i]', case=False)",
+        ]
+        for q in queries:
+            with self.subTest(q=q):
+                self.assertTrue(_is_simple_and_expr(q))
+                expected = df.index.isin(df.query(q, engine="python").index)
+                self.assertEqual(_rows(_mask_from_clauses(df, q)), _rows(expected))
+
+
+class RownumFilterTests(TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({"units": [5, 150, 20, 900]})
+
+    def test_out_of_range_rownums_select_nothing(self):
+        for q in ("row == 99999999999999999999", "row == 0", "row == 5", "`units` > 10 and row == 99999999999999999999"):
+            with self.subTest(q=q):
+                self.assertEqual(_rows(_ensure_mask_from_query(self.df, q)), [False] * 4)
+
+    def test_rownum_global_and_within_group(self):
+        self.assertEqual(_rows(_ensure_mask_from_query(self.df, "row == 2")), [False, True, False, False])
+        self.assertEqual(_rows(_ensure_mask_from_query(self.df, "`units` > 10 and row == 2")), [False, False, True, False])
+
+
+class PrefixSuffixClauseTests(TestCase):
+    def test_case_insensitive_startswith_endswith(self):
+        df = pd.DataFrame({"name": ["Alpha", "beta.x", "Café", None, "a+b"]})
+        cases = {
+            "`name`.str.startswith('AL')": [True, False, False, False, False],
+            "`name`.str.endswith('.X')": [False, True, False, False, False],
+            "`name`.str.endswith('É')": [False, False, True, False, False],
+            "`name`.str.startswith('A+', case=False)": [False, False, False, False, True],
+            "`name`.str.startswith('al', case=True)": [False, False, False, False, False],
+        }
+        for q, expected in cases.items():
+            with self.subTest(q=q):
+                self.assertEqual(_rows(_mask_from_clauses(df, q)), expected)
+
+    def test_case_insensitive_turkish_i(self):
+        # Pinned to str.lower() on both sides: "İ" lowers to "i̇", "ı" has no ASCII fold
+        df = pd.DataFrame({"city": ["İzmir", "Izmir", "Diyarbakır", "ıspir", None]})
+        cases = {
+            "`city`.str.startswith('i', case=False)": [True, True, False, False, False],
+            "`city`.str.startswith('ı', case=False)": [False, False, False, True, False],
+            "`city`.str.endswith('IR', case=False)": [True, True, False, True, False],
+            "`city`.str.endswith('ır', case=False)": [False, False, True, False, False],
+        }
+        for q, expected in cases.items():
+            with self.subTest(q=q):
+                self.assertEqual(_rows(_mask_from_clauses(df, q)), expected)
+
+
+class StringEqualityClauseTests(TestCase):
+    """`col == 'v'` compares casefolded values, so full case folding still applies."""
+
+    def test_casefold_equality(self):
+        df = pd.DataFrame({"street": ["straße", "STRASSE", "Strasse", "strase", None]})
+        q = "`street` == 'STRASSE'"
+        self.assertEqual(_rows(_mask_from_clauses(df, q)), [True, True, True, False, False])
+
+    def test_repeated_column_clauses_are_anded(self):
+        df = pd.DataFrame({"city": ["Paris", "paris", "Rome"]})
+        self.assertEqual(_rows(_mask_from_clauses(df, "`city` == 'PARIS' and `city` == 'paris'")), [True, True, False])
+        self.assertEqual(_rows(_mask_from_clauses(df, "`city` == 'Paris' and `city` == 'Rome'")), [False, False, False])
@@ -0,0 +1,63 @@
+import os
+import tempfile
+
+import pandas as pd
+from django.test import SimpleTestCase
+
+from api.views import _read_csv_with_fallbacks, _write_csv, sanitize_for_json
+
+
+class ReadCsvWithFallbacksTests(SimpleTestCase):
+    """Uploads must parse exactly as the pandas C engine reads them."""
+
+    def _read(self, raw: bytes):
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(raw)
+        self.addCleanup(os.remove, path)
+        return _read_csv_with_fallbacks(path)
+
+    def test_latin1_file_decodes_to_text(self):
+        df = self._read(b"name\ncaf\xe9\nx\n")
+        self.assertEqual(df["name"].tolist(), ["café", "x"])
+
+    def test_huge_ids_and_times_stay_text(self):
+        df = self._read(b"id,t\n99999999999999999999,12:30:00\n1,13:00:00\n")
+        self.assertEqual(df["id"].tolist(), ["99999999999999999999", "1"])
+        self.assertEqual(df["t"].tolist(), ["12:30:00", "13:00:00"])
+
+    def test_signed_integers_and_na_strings(self):
+        df = self._read(b"n,s\n+5,NA\n-0,\n")
+        self.assertEqual(df["n"].tolist(), [5, 0])
+        self.assertEqual(df["s"].tolist(), ["NA", ""])
+
+
+class WriteCsvTests(SimpleTestCase):
+    """Exports are re-read when chaining: the file must parse back to what pandas' to_csv gives."""
+
+    def _roundtrip(self, df, writer):
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        writer(df, path)
+        return _read_csv_with_fallbacks(path)
+
+    def test_export_reads_back_like_to_csv(self):
+        df = pd.DataFrame({
+            "id": [1, 2, 3],
+            "name": ["a,b", 'x"y', "line\nbreak"],
+            "digits": ["001", "2", "99999999999999999999"],
+            "maybe": ["", None, "z"],
+            "num": [1.0, 2.5, None],
+        })
+        pandas_writer = lambda d, p: d.to_csv(p, index=False, encoding="utf-8-sig")  # noqa: E731
+        for frame in (df, df.drop(columns=["num"])):
+            with self.subTest(columns=list(frame.columns)):
+                pd.testing.assert_frame_equal(self._roundtrip(frame, _write_csv), self._roundtrip(frame, pandas_writer))
+
+
+class SanitizeForJsonTests(SimpleTestCase):
+    def test_flat_numbers(self):
+        big = 10 ** 400
+        self.assertEqual(sanitize_for_json([1, 2.5, float("nan"), float("-inf"), big]), [1, 2.5, None, None, big])
+        self.assertEqual(sanitize_for_json({"k": (big, float("inf"))}), {"k": [big, None]})
@@ -1,6 +1,11 @@
+import os
 import re
-from datetime import datetime
-from typing import Optional, Tuple, Any
+import functools
+from datetime import datetime, timedelta
+from typing import Optional, Tuple, Any, Callable
+
+import numpy as np
+import pandas as pd
 
 try:
     # Prefer dateparser (more intelligent: multi-language, Chinese "年/月/日", fuzzy strings, etc.)
@@ -16,43 +21,85 @@ try:
 except Exception:
     _HAS_DATEUTIL = False
 
+# dateparser is slow and only needed for fuzzy input; set USE_DATEPARSER=0 to skip it
+_USE_DATEPARSER = _HAS_DATEPARSER and os.getenv("USE_DATEPARSER", "1") != "0"
+
 
-# —— Common date tokens: digits with slash/dash/dot; Chinese; compact 8-digit 20240512 —— #
-DATE_TOKEN_RX = re.compile(
-    r"""(?xi)
-    (?:                                    # Typical: 2024-5-1 / 2024/05/01 / 2024.05.01
-        \b\d{4}[-/.]\d{1,2}[-/.]\d{1,2}\b
-    )|
-    (?:                                    # Typical: 1/5/24 or 05/12/2024 (ambiguity decided by dayfirst)
-        \b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b
-    )|
-    (?:                                    # Compact: 20240501
-        \b\d{8}\b
-    )|
-    (?:                                    # Chinese: 2024年5月1日 ("日" is optional)
-        \b\d{4}年\d{1,2}月\d{1,2}日?\b
+# —— Common date tokens: compact 8-digit 20240512; digits with slash/dash/dot —— #
+# Most specific shape first. Boundaries are explicit lookarounds rather than \b: only ASCII
+# letters, "_" and digits count as word characters, so "出生2024-05-01" also matches, while \d
+# stays Unicode so full-width dates ("２０２４-０５-０１") are still found.
+_DATE_TOKEN_ALTS = r"""
+    (?<![A-Za-z_\d])
+    (?:
+        \d{8}                              # Compact: 20240501
+      | \d{4}[-/.]\d{1,2}[-/.]\d{1,2}       # Typical: 2024-5-1 / 2024/05/01 / 2024.05.01
+      | \d{1,2}[-/]\d{1,2}[-/]\d{2,4}       # Typical: 1/5/24 or 05/12/2024 (ambiguity decided by dayfirst)
     )
-    """,
-)
+    (?![A-Za-z_\d])
+"""
+DATE_TOKEN_RX = re.compile(r"(?x)" + _DATE_TOKEN_ALTS)
+
+_DIGIT_RX = re.compile(r"\d")
+
+# —— Chinese: 2024年5月1日 ("日" is optional); only tried when the text contains "年" —— #
+# Unicode \b here so a trailing "日" stays part of the token
+CJK_DATE_RX = re.compile(r"\b\d{4}年\d{1,2}月\d{1,2}日?\b")
+# One scan for both shapes over the original text, so CJK output is never re-matched
+_DATE_OR_CJK_RX = re.compile(r"(?x)(?:" + _DATE_TOKEN_ALTS + r")|" + CJK_DATE_RX.pattern)
+
+# Day 0 of Excel's (Windows, 1900-based) serial date system
+_EXCEL_EPOCH = datetime(1899, 12, 30)
 
 _ORDINAL_RX = re.compile(r"(\b\d{1,2})(st|nd|rd|th)\b", re.IGNORECASE)
 
+# —— Fast paths for the DATE_TOKEN_RX shapes (CJK is normalized to Y-M-D first) —— #
+_RX_YMD = re.compile(r"^(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})$")
+_RX_DMY = re.compile(r"^(\d{1,2})[-/](\d{1,2})[-/](\d{4})$")
+
+# Simple safe mapping (extend when needed); tokens are disjoint, so one left-to-right pass suffices
+_STRFTIME_MAP = {
+    "YYYY": "%Y", "YY": "%y",
+    "MM": "%m", "DD": "%d",
+    "HH": "%H", "mm": "%M", "ss": "%S",
+}
+_FMT_TOKEN_RX = re.compile(r"YYYY|YY|MM|DD|HH|mm|ss")
+
+@functools.lru_cache(maxsize=32)
 def _to_strftime(fmt: str) -> str:
     """Map a human format like 'YYYY-MM-DD HH:mm:ss' to a strftime pattern."""
-    # Simple safe mapping (extend when needed)
-    mapping = {
-        "YYYY": "%Y", "YY": "%y",
-        "MM": "%m", "DD": "%d",
-        "HH": "%H", "mm": "%M", "ss": "%S",
-    }
-    out = fmt
-    for k, v in mapping.items():
-        out = out.replace(k, v)
-    return out
+    return _FMT_TOKEN_RX.sub(lambda m: _STRFTIME_MAP[m.group(0)], fmt)
+
+# Positional fields fed to the formatter template below
+_FMT_FIELDS = {"YYYY": "{0:04d}", "YY": "{1:02d}", "MM": "{2:02d}", "DD": "{3:02d}",
+               "HH": "{4:02d}", "mm": "{5:02d}", "ss": "{6:02d}"}
+
+@functools.lru_cache(maxsize=32)
+def _make_formatter(fmt: str) -> Callable[[datetime], str]:
+    """
+    Build a datetime -> str function for a human format like 'YYYY-MM-DD'.
+
+    str.format on a prebuilt template is much cheaper than strftime, which re-parses
+    its pattern on every call. Formats containing '%' keep using strftime.
+    """
+    if "%" in fmt:
+        strf = _to_strftime(fmt)
+        return lambda dt: dt.strftime(strf)
+
+    parts: list[str] = []
+    last = 0
+    for m in _FMT_TOKEN_RX.finditer(fmt):
+        parts.append(fmt[last:m.start()].replace("{", "{{").replace("}", "}}"))
+        parts.append(_FMT_FIELDS[m.group(0)])
+        last = m.end()
+    parts.append(fmt[last:].replace("{", "{{").replace("}", "}}"))
+    template = "".join(parts).format
+
+    return lambda dt: template(dt.year, dt.year % 100, dt.month, dt.day, dt.hour, dt.minute, dt.second)
 
 def _compact8_to_iso(s: str) -> Optional[datetime]:
-    # 20240501 → 2024-05-01
-    if re.fullmatch(r"\d{8}", s):
+    # 20240501 → 2024-05-01 (isdecimal matches what \d accepts, without a regex call)
+    if len(s) == 8 and s.isdecimal():
         y, m, d = int(s[:4]), int(s[4:6]), int(s[6:])
         try:
             return datetime(y, m, d)
@@ -60,8 +107,29 @@ def _compact8_to_iso(s: str) -> Optional[datetime]:
             return None
     return None
 
-def _parse_one(token: str, dayfirst: Optional[bool]) -> Optional[datetime]:
-    """Robust parsing: dateparser > dateutil > simple fallback."""
+def _fast_parse(token: str, dayfirst: Optional[bool]) -> Optional[datetime]:
+    """Build datetimes directly for well-formed numeric tokens; None means 'ask the parsers'."""
+    m = _RX_YMD.match(token)
+    if m:
+        y, a, b = int(m[1]), int(m[2]), int(m[3])
+    else:
+        m = _RX_DMY.match(token)
+        if not m:
+            return None
+        a, b, y = int(m[1]), int(m[2]), int(m[3])
+
+    # Preferred order first; swap when the first segment cannot be a month/day.
+    # Like the parsers below, dayfirst also reads year-first tokens as Y-D-M.
+    d, mo = (a, b) if dayfirst else (b, a)
+    for dd, mm in ((d, mo), (mo, d)):
+        try:
+            return datetime(y, mm, dd)
+        except ValueError:
+            continue
+    return None
+
+def _parse_one_uncached(token: str, dayfirst: Optional[bool]) -> Optional[datetime]:
+    """Robust parsing: regex fast path > dateparser > dateutil > simple fallback."""
     # Remove ordinal suffix 1st/2nd/3rd/4th
     token = _ORDINAL_RX.sub(r"\1", token)
 
@@ -74,7 +142,11 @@ def _parse_one(token: str, dayfirst: Optional[bool]) -> Optional[datetime]:
     if dt:
         return dt
 
-    if _HAS_DATEPARSER:
+    dt = _fast_parse(token, dayfirst)
+    if dt:
+        return dt
+
+    if _USE_DATEPARSER:
         # settings: PREFER_DAY_OF_MONTH=first can reduce ambiguity;
         # languages are detected automatically
         settings = {
@@ -108,6 +180,13 @@ def _parse_one(token: str, dayfirst: Optional[bool]) -> Optional[datetime]:
             continue
     return None
 
+# The same date strings repeat across rows; parse each (token, dayfirst) pair once.
+# Call _parse_one.cache_clear() to release memory if needed.
+_parse_one = functools.lru_cache(maxsize=131072)(_parse_one_uncached)
+
+_DF_RX = re.compile(r"\b(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})\b")
+_DF_HINT_RX = re.compile(r"\b(1[3-9]|2[0-9]|3[01])\b")
+
 def guess_dayfirst(samples: list[str]) -> Optional[bool]:
     """
     Roughly guess ambiguity from samples (if any first/second segment > 12, prefer dayfirst).
@@ -116,15 +195,19 @@ def guess_dayfirst(samples: list[str]) -> Optional[bool]:
     """
     ambiguous_hits = 0
     dayfirst_votes = 0
+    search_date, search_hint = _DF_RX.search, _DF_HINT_RX.search
     for s in samples[:200]:
-        m = re.search(r"\b(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})\b", s)
+        # No separator means no D/M/Y token; skip the regex engine entirely
+        if "/" not in s and "-" not in s:
+            continue
+        m = search_date(s)
         if not m:
             continue
         a, b = int(m.group(1)), int(m.group(2))
         if a <= 12 and b <= 12:
             ambiguous_hits += 1
             # Look for other tokens > 12 as hints
-            if re.search(r"\b(13|14|15|1[6-9]|2[0-9]|3[01])\b", s):
+            if search_hint(s):
                 # If 13–31 is present, cast a vote for dayfirst
                 dayfirst_votes += 1
     if ambiguous_hits == 0:
@@ -144,20 +227,27 @@ def normalize_date_text(
     if not text:
         return text, 0
 
-    fmt = _to_strftime(out_fmt)
-    count = 0
+    text = text if isinstance(text, str) else str(text)
+    # Every date shape needs a digit; one C-level scan skips free-form notes
+    if not _DIGIT_RX.search(text):
+        return text, 0
+
+    fmt = _make_formatter(out_fmt)
+    failures = 0
 
     def _repl(m: re.Match) -> str:
-        nonlocal count
+        nonlocal failures
         token = m.group(0)
         dt = _parse_one(token, dayfirst=dayfirst)
         if dt is None:
+            failures += 1
             return token
-        count += 1
-        return dt.strftime(fmt)
+        return fmt(dt)
 
-    new_text = DATE_TOKEN_RX.sub(_repl, str(text))
-    return new_text, count
+    # subn counts every match; unparseable tokens are kept as-is and subtracted
+    rx = _DATE_OR_CJK_RX if "年" in text else DATE_TOKEN_RX
+    new_text, n = rx.subn(_repl, text)
+    return new_text, n - failures
 
 def normalize_cell_as_whole(
     value: Any,
@@ -172,7 +262,7 @@ def normalize_cell_as_whole(
 
     Also includes simple handling of Excel serial dates (1900-based).
     """
-    fmt = _to_strftime(out_fmt)
+    fmt = _make_formatter(out_fmt)
 
     # Excel serial (1900-based, float/int)
     if isinstance(value, (int, float)) and not isinstance(value, bool):
@@ -180,15 +270,83 @@ def normalize_cell_as_whole(
         # restrict to a reasonable range
         n = float(value)
         if 10_000 <= n <= 80_000:
-            base = datetime(1899, 12, 30)
-            try:
-                dt = base + timedelta(days=n)
-                return dt.strftime(fmt), 1
-            except Exception:
-                pass
+            # In this range the offset cannot overflow, so no exception handling is needed
+            return fmt(_EXCEL_EPOCH + timedelta(days=n)), 1
 
     s = "" if value is None else str(value)
     dt = _parse_one(s, dayfirst=dayfirst)
     if dt is None:
         return s, 0
-    return dt.strftime(fmt), 1
+    return fmt(dt), 1
+
+def normalize_series(
+    series: pd.Series,
+    out_fmt: str = "YYYY-MM-DD",
+    dayfirst: Optional[bool] = None,
+) -> tuple[pd.Series, int]:
+    """
+    Column-level version of normalize_cell_as_whole for string columns (the executor
+    casts cells to strings first, so there is no Excel-serial branch here).
+
+    pd.to_datetime parses the whole column in one pass; cells it cannot read
+    are retried with _parse_one once per distinct string. Missing cells are left as-is.
+    Low-cardinality columns are normalized once per distinct value and broadcast back.
+
+    Returns (new_series, number_of_normalized_cells).
+    """
+    codes, uniques = pd.factorize(series)
+    if len(uniques) <= len(series) // 2:
+        u_out, u_done = _normalize_values(pd.Series(uniques), out_fmt, dayfirst)
+        out = series.astype(object)
+        valid = codes >= 0
+        out.iloc[np.flatnonzero(valid)] = u_out.to_numpy()[codes[valid]]
+        return out, int(u_done[codes[valid]].sum())
+    out, done = _normalize_values(series, out_fmt, dayfirst)
+    return out, int(done.sum())
+
+
+def _normalize_values(
+    series: pd.Series,
+    out_fmt: str,
+    dayfirst: Optional[bool],
+) -> tuple[pd.Series, np.ndarray]:
+    """Body of normalize_series: (object series, per-row bool 'normalized' flags)."""
+    fmt = _to_strftime(out_fmt)
+    strs = series.astype("string")
+    out = series.astype(object)
+    present = strs.notna().to_numpy()
+    done = np.zeros(len(series), dtype=bool)
+
+    try:
+        parsed = pd.to_datetime(strs, errors="coerce", dayfirst=bool(dayfirst), format="mixed")
+        ok = parsed.notna().to_numpy() & present if pd.api.types.is_datetime64_any_dtype(parsed) else None
+    except Exception:
+        # e.g. mixed timezones; leave everything to the per-value path
+        ok = None
+    if ok is None:
+        ok = present & False
+    elif dayfirst:
+        # pd.to_datetime keeps year-first text as Y-M-D; _parse_one reads it as Y-D-M
+        ok &= ~strs.str.match(r"\s*\d{4}\D", na=False).to_numpy(dtype=bool)
+
+    if ok.any():
+        out[ok] = parsed[ok].dt.strftime(fmt)
+        done |= ok
+
+    residual = np.flatnonzero(present & ~ok)
+    if len(residual):
+        # Parse each distinct leftover string once; broadcast through the codes, no per-row map
+        codes, uniques = pd.factorize(strs.iloc[residual])
+        u_out = np.empty(len(uniques), dtype=object)
+        u_ok = np.zeros(len(uniques), dtype=bool)
+        fmt_one = _make_formatter(out_fmt)
+        for i, s in enumerate(uniques):
+            dt = _parse_one(s, dayfirst=dayfirst)
+            if dt is not None:
+                u_out[i], u_ok[i] = fmt_one(dt), True
+        got = u_ok[codes]
+        if got.any():
+            out.iloc[residual[got]] = u_out[codes[got]]
+            done[residual[got]] = True
+
+    return out, done
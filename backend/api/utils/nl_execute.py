@@ -5,15 +5,17 @@ from typing import Dict, Any, Tuple
 from .plan_v2 import plan_with_llm
 from .regex_executor import execute_plan
 
+# backend/api/media (default export location for nl_execute)
+DEFAULT_MEDIA_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "media")
+
 
 def get_sample_rows_for_llm(df):
-    """ Get <= 2 random sample rows for LLM context"""
+    """ Get <= 2 sample rows (first and middle) for LLM context"""
     if df.empty:
         return []
-    n = min(2, len(df))
-    # random rows; you can also use df.head(n) if you prefer deterministic
-    sample_df = df.sample(n=n, random_state=42)
-    return sample_df.to_dict(orient="records")
+    # positional picks: the LLM only needs value shapes, and df.sample would permute the whole index
+    positions = [0, len(df) // 2] if len(df) >= 2 else [0]
+    return df.iloc[positions].to_dict(orient="records")
 
 
 def nl_execute(
@@ -52,10 +54,12 @@ def nl_execute(
 
     # Optional export (views.execute may rewrite this as an absolute URL)
     if want_download:
-        media_root = media_root or os.path.join(os.path.dirname(os.path.dirname(__file__)), "media")
+        media_root = media_root or DEFAULT_MEDIA_ROOT
         os.makedirs(media_root, exist_ok=True)
         out_name = f"{file_tag}.csv"
         out_path = os.path.join(media_root, out_name)
-        new_df.to_csv(out_path, index=False)
+        # 1 MiB write buffer and bounded chunks keep large exports off the small-write path
+        with open(out_path, "w", buffering=1 << 20, newline="", encoding="utf-8") as fh:
+            new_df.to_csv(fh, index=False, chunksize=50_000)
 
     return new_df, payload
@@ -1,6 +1,7 @@
 import os
 import re
 import json
+import functools
 import traceback
 from typing import List, Optional, Tuple, Dict, Any, Sequence
 
@@ -19,6 +20,19 @@ try:
 except Exception:
     _HAS_JSON_REPAIR = False
 
+try:
+    # pip install orjson
+    import orjson  # type: ignore
+    _HAS_ORJSON = True
+except Exception:
+    _HAS_ORJSON = False
+
+
+# Regex flags a plan may carry; keep 'u'/'U' too
+_ALLOWED_FLAGS = frozenset("imsluxUu")
+# Replacements pandas would read back as missing values
+_NA_REPLACEMENTS = frozenset(("NA", "N/A", "NaN", "nan", "na"))
+
 
 # Pydantic schema
 class RegexPlan(BaseModel):
@@ -32,15 +46,12 @@ class RegexPlan(BaseModel):
 
     def normalize(self) -> "RegexPlan":
         """ Return a normalized copy of the plan"""
-        # allow only safe flags; keep 'u'/'U' too
-        allowed = "imsluxUu"
-        safe = "".join(ch for ch in (self.flags or "i") if ch in allowed) or "i"
-
-        rep = (self.replacement or "").strip() or None
+        # allow only safe flags
+        safe = "".join(ch for ch in (self.flags or "i") if ch in _ALLOWED_FLAGS) or "i"
 
         rep = (self.replacement or "").strip() or None
         # Avoid pandas NA strings like "NA", "N/A", etc.
-        if rep == "NA" or rep == "N/A" or rep == "NaN" or rep == "nan" or rep == "na":
+        if rep in _NA_REPLACEMENTS:
             rep = "N/A (missing)"
 
         # Ensure pattern is a non-empty string; fall back to match-all
@@ -57,6 +68,15 @@ FALLBACKS: Dict[str, str] = {
 }
 
 
+# "... where <Column> = 'value'" in rule-based instructions
+_WHERE_RX = re.compile(
+    r"""\bwhere\s+([A-Za-z0-9_ ]+)\s*(?:=|==|:|\bis\b|\bequals?\b)\s*(['"].+?['"]|\d+)""",
+    re.IGNORECASE,
+)
+# `Column` references inside a row_filter
+_TICK_RX = re.compile(r"`([^`]+)`")
+
+
 def _guess_pattern(instr: str) -> str:
     """Simple keyword pattern guesser"""
     l = (instr or "").lower()
@@ -70,7 +90,6 @@ def _rule_plan(instruction: str, headers: List[str]) -> Tuple[RegexPlan, str]:
     """ Simple rule-based plan generator (fallback)"""
     l = (instruction or "").lower()
     intent = "replace" if any(w in l for w in ["replace", "redact", "mask", "anonym"]) else "find"
-    pattern = _guess_pattern(l)
     # Detect "date normalization" keywords
     if any(k in l for k in ["normalize date", "normalise date", "standardize date","standardise date", "unify date"]):
       intent = "replace"
@@ -82,7 +101,7 @@ def _rule_plan(instruction: str, headers: List[str]) -> Tuple[RegexPlan, str]:
       columns = cols or None
       return RegexPlan(intent=intent, pattern=pattern, flags="i", columns=columns,
                       replacement=replacement, row_filter=None), "fallback"
-    
+
     pattern = _guess_pattern(l)
 
     # prefer columns which look like the common fields
@@ -94,10 +113,7 @@ def _rule_plan(instruction: str, headers: List[str]) -> Tuple[RegexPlan, str]:
     columns = cols or None
 
     # simple where clause
-    m = re.search(
-        r"""(?i)\bwhere\s+([A-Za-z0-9_ ]+)\s*(?:=|==|:|\bis\b|\bequals?\b)\s*(['"].+?['"]|\d+)""",
-        instruction or "",
-    )
+    m = _WHERE_RX.search(instruction or "")
     row_filter = None
 
     if m:
@@ -125,6 +141,11 @@ def _format_sample_rows(sample_rows: Optional[Sequence[Dict[str, Any]]], max_row
         return "None"
     try:
         subset = list(sample_rows)[:max_rows]
+        if _HAS_ORJSON:
+            try:
+                return orjson.dumps(subset, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+            except TypeError:
+                pass  # e.g. pandas Timestamp values; let the stdlib path decide
         return json.dumps(subset, ensure_ascii=False)
     except Exception:
         # Fall back to a simple repr if something goes wrong
@@ -172,7 +193,7 @@ def _validate_plan(plan: RegexPlan, headers: List[str]) -> None:
 
     # flags
     for f in plan.flags:
-        if f not in "imsluxUu":
+        if f not in _ALLOWED_FLAGS:
             errors.append(f"unsupported flag '{f}'")
 
     # columns exist
@@ -188,7 +209,7 @@ def _validate_plan(plan: RegexPlan, headers: List[str]) -> None:
 
     # row_filter sanity: verify backticked column names exist
     if plan.row_filter:
-        ticks = re.findall(r"`([^`]+)`", plan.row_filter)
+        ticks = _TICK_RX.findall(plan.row_filter)
         legit_names = set(headers)
         for t in ticks:
             if t not in legit_names:
@@ -234,7 +255,8 @@ Recall-first rules:
 
 You may also be given up to 2 SAMPLE_ROWS as JSON records. They show typical values for each column.
 Use them only to understand data formats and semantics (e.g., how dates/emails look), but do NOT copy any values from SAMPLE_ROWS into the output.
-Output ONLY the JSON object, no explanations.
+Before returning, verify the plan against every rule above; if any rule fails, fix it silently.
+Output ONLY the final JSON object, no explanations.
 """
 
 REPAIRER = """
@@ -256,8 +278,9 @@ You are a validator. Given HEADERS, INSTRUCTION, and a CANDIDATE JSON plan:
 
 
 # ---------- LLM helpers ----------
+@functools.lru_cache(maxsize=1)
 def _gemini_client():
-    """ Gemini client setup"""
+    """ Gemini client setup (built once per process; failures are not cached)"""
     if genai is None:
         raise ImportError(
             "google-genai SDK not available. Install with: pip install -U google-genai"
@@ -274,10 +297,12 @@ def _gemini_client():
 def _plan_from_raw(raw: str) -> RegexPlan:
     """
     Parse an LLM JSON string into a RegexPlan.
-    1) try strict JSON -> Pydantic
+    1) try strict JSON -> Pydantic (pre-parsed with orjson when available)
     2) if that fails and json-repair is available, repair then parse
     """
     try:
+        if _HAS_ORJSON:
+            return RegexPlan.model_validate(orjson.loads(raw)).normalize()
         return RegexPlan.model_validate_json(raw).normalize()
     except Exception:
         if _HAS_JSON_REPAIR:
@@ -406,7 +431,8 @@ def plan_with_llm(
       - GEMINI_API_KEY: required if LLM_PROVIDER='gemini'
       - GEMINI_MODEL: optional (default 'gemini-2.5-flash')
       - MAX_LLM_ATTEMPTS: int, default 2 (first try + one repair)
-      - ENABLE_CRITIC: '1' to enable critic escalation
+      - ENABLE_CRITIC: '1' to add a separate critic call (audit runs only; the
+        generator prompt already self-verifies, so this costs an extra round-trip)
     """
     provider = os.getenv("LLM_PROVIDER", "rule_based").lower()
     if provider != "gemini" or genai is None or not os.getenv("GEMINI_API_KEY"):
@@ -416,7 +442,7 @@ def plan_with_llm(
         return plan.normalize(), src, ""
     
     MAX_ATTEMPTS = max(1, int(os.getenv("MAX_LLM_ATTEMPTS", "2")))
-    ENABLE_CRITIC = 0 # default to disable to save token costs
+    ENABLE_CRITIC = os.getenv("ENABLE_CRITIC", "0") == "1"  # off by default: one round-trip per plan
 
     try:
         # print("using gemini")
@@ -427,7 +453,7 @@ def plan_with_llm(
             plan, raw = _llm_generate_once(client, model, gen_cfg, instruction, headers, sample_rows)
             plan = _align_columns(plan, headers)
             _validate_plan(plan, headers)
-            # Always run critic by default
+            # Separate critic pass only for audit runs
             if ENABLE_CRITIC:
                 review = _critic_review(client, model, gen_cfg, instruction, headers, raw, sample_rows)
                 if review:
@@ -452,7 +478,7 @@ def plan_with_llm(
                 )
                 plan = _align_columns(plan, headers)
                 _validate_plan(plan, headers)
-                # Always run critic by default
+                # Separate critic pass only for audit runs
                 if ENABLE_CRITIC:
                     review = _critic_review(client, model, gen_cfg, instruction, headers, raw, sample_rows)
                     if review:
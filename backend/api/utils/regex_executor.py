@@ -1,9 +1,25 @@
+import os
 import re
 import html
+import logging
+import functools
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional, Any
 
-from .date_normalizer import normalize_date_text, normalize_cell_as_whole, guess_dayfirst
+from .date_normalizer import normalize_date_text, normalize_series, guess_dayfirst
+
+log = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    _HAS_PYARROW = True
+except Exception:
+    _HAS_PYARROW = False
+
+# Arrow-backed strings keep one contiguous buffer per column and run .str.* in compiled kernels
+_STRING_DTYPE = "string[pyarrow]" if (_HAS_PYARROW and os.getenv("USE_ARROW_STRINGS", "1") != "0") else "string"
 
 
 # Helpers
@@ -46,67 +62,312 @@ def _compile_flags(flags: str) -> int:
     return f or re.IGNORECASE
 
 
+@functools.lru_cache(maxsize=512)
+def _get_rx(pattern: str, flags: str) -> re.Pattern:
+    """Compiled user pattern (empty -> match-all), cached across columns and requests."""
+    return re.compile(pattern or "^.*$", _compile_flags(flags))
+
+
 # Row-filter normalization
+_TRUE_RE = re.compile(r'\btrue\b')
+_FALSE_RE = re.compile(r'\bfalse\b')
+_STR_OP_RAW_RE = re.compile(r'(\.str\.(?:contains|match|fullmatch|replace)\(\s*)([\'\"])')
+_ASTYPE_STR_RE = re.compile(r'\.astype\(\s*str\s*\)')
+_ASTYPE_QSTR_RE = re.compile(r'\.astype\(\s*["\']str["\']\s*\)')
+_STRIP_CASE_RE = re.compile(r'(?P<prefix>\.str\.(?:startswith|endswith))\(\s*(?P<inner>[^)]*?)\)')
+_CASE_TRAIL_RE = re.compile(r'\s*,\s*case\s*=\s*(?:True|False)')
+_CASE_LEAD_RE = re.compile(r'case\s*=\s*(?:True|False)\s*,\s*')
+
+
+@functools.lru_cache(maxsize=64)
+def _column_patterns(headers: Tuple[str, ...]) -> Tuple[re.Pattern, re.Pattern]:
+    """
+    (quoted_re, bare_re) matching any header, longest header first in the alternation.
+    Cached per header tuple: the same table is filtered many times per session.
+    """
+    alt = "|".join(re.escape(c) for c in sorted(dict.fromkeys(headers), key=len, reverse=True))
+    quoted = re.compile(rf'(?<!`)(["\'])(?P<col>{alt})\1(?!`)')
+    bare = re.compile(
+        rf'(?<![`"\w])(?P<col>{alt})(?=\s*(?:\.str\b|\.astype\b|\.isin\b|\)|\]|\b(?:in|not\s+in)\b|==|!=|>=|<=|>|<))'
+    )
+    return quoted, bare
+
+
+def _backtick_col(m: re.Match) -> str:
+    return f'`{m.group("col")}`'
+
+
 def _normalize_row_filter(query: str, headers: List[str]) -> str:
     """Normalize a pandas query-like string for row filtering."""
     if not query:
         return query
+    return _normalize_row_filter_cached(str(query), tuple(headers))
 
-    q = str(query)
 
+@functools.lru_cache(maxsize=512)
+def _normalize_row_filter_cached(q: str, headers: Tuple[str, ...]) -> str:
+    """Cached body of _normalize_row_filter (the same filter is re-run across FIND/REPLACE round-trips)."""
     # Convert JS-style booleans to Python booleans
-    q = re.sub(r'\btrue\b', 'True', q)
-    q = re.sub(r'\bfalse\b', 'False', q)
-
-    # "Col"/'Col' -> `Col`
-    for col in sorted(headers, key=len, reverse=True):
-        q = re.sub(rf'(?<!`)(["\']){re.escape(col)}\1(?!`)', f'`{col}`', q)
-
-    # Bare column names used as identifiers -> `Col`
-    for col in sorted(headers, key=len, reverse=True):
-        q = re.sub(
-            rf'(?<![`"\w]){re.escape(col)}(?=\s*(?:\.str\b|\.astype\b|\.isin\b|\)|\]|\b(?:in|not\s+in)\b|==|!=|>=|<=|>|<))',
-            f'`{col}`',
-            q
-        )
+    q = _TRUE_RE.sub('True', q)
+    q = _FALSE_RE.sub('False', q)
+
+    if headers:
+        quoted, bare = _column_patterns(headers)
+        # "Col"/'Col' -> `Col`
+        q = quoted.sub(_backtick_col, q)
+        # Bare column names used as identifiers -> `Col`
+        q = bare.sub(_backtick_col, q)
 
     # Ensure first argument of .str.contains/.match/.fullmatch/.replace is a raw string
-    q = re.sub(r'(\.str\.(?:contains|match|fullmatch|replace)\(\s*)([\'\"])', r'\1r\2', q)
+    if ".str." in q:
+        q = _STR_OP_RAW_RE.sub(r'\1r\2', q)
 
     # Fix astype(str) -> astype("string") so df.query doesn't need a name 'str'
     # Also normalize astype("str") -> astype("string")
-    q = re.sub(r'\.astype\(\s*str\s*\)', ".astype('string')", q)
-    q = re.sub(r'\.astype\(\s*["\']str["\']\s*\)', ".astype('string')", q)
+    if ".astype(" in q:
+        q = (q.replace(".astype(str)", ".astype('string')")
+              .replace('.astype("str")', ".astype('string')")
+              .replace(".astype('str')", ".astype('string')"))
+        # Regexes only for the whitespace-padded spellings
+        if q.count(".astype(") != q.count(".astype('string')"):
+            q = _ASTYPE_STR_RE.sub(".astype('string')", q)
+            q = _ASTYPE_QSTR_RE.sub(".astype('string')", q)
 
     # Strip unsupported 'case=' kwarg from .str.startswith/.endswith (pandas doesn't support it)
     def _strip_case_for_prefix(m: re.Match) -> str:
         inner = m.group("inner")
-        inner2 = re.sub(r'\s*,\s*case\s*=\s*(?:True|False)', '', inner)
-        inner2 = re.sub(r'case\s*=\s*(?:True|False)\s*,\s*', '', inner2)
+        inner2 = _CASE_TRAIL_RE.sub('', inner)
+        inner2 = _CASE_LEAD_RE.sub('', inner2)
         return f"{m.group('prefix')}({inner2})"
 
-    q = re.sub(
-        r'(?P<prefix>\.str\.(?:startswith|endswith))\(\s*(?P<inner>[^)]*?)\)',
-        _strip_case_for_prefix,
-        q,
-    )
+    if "case" in q and (".str.startswith(" in q or ".str.endswith(" in q):
+        q = _STRIP_CASE_RE.sub(_strip_case_for_prefix, q)
 
     ## TODO: add other normalisations???
 
     return q
 
 def _to_string(s: pd.Series) -> pd.Series:
-    """Coerce a Series to pandas' string dtype."""
+    """Coerce a Series to pandas' string dtype (Arrow-backed when pyarrow is available)."""
+    try:
+        return s.astype(_STRING_DTYPE)
+    except Exception:
+        return s.astype("string")
+
+
+def _regex_strings(s: pd.Series, pat: str, case: bool) -> pd.Series:
+    """
+    String view of a column for a user-regex .str.* clause. Arrow strings hand the regex to
+    RE2, so they are only used when RE2 reads `pat` exactly as Python's re does.
+    """
+    if _STRING_DTYPE != "string" and _re2_pattern(pat, 0 if case else re.IGNORECASE) == pat:
+        return _to_string(s)
     return s.astype("string")
 
 
+def _string_columns(df: pd.DataFrame, cols: List[str]) -> Dict[Any, pd.Series]:
+    """Cast `cols` to strings in one block astype; repeated labels fall back to per-column casts."""
+    if df.columns.is_unique and len(set(cols)) == len(cols):
+        try:
+            block = df[cols].astype(_STRING_DTYPE)
+        except Exception:
+            block = None
+        if block is not None:
+            return {c: block[c] for c in cols}
+    return {c: _to_string(df[c]) for c in dict.fromkeys(cols)}
+
+
+def _inf_mask(s: pd.Series) -> Optional[np.ndarray]:
+    """Positions holding ±Inf in a float or object column (None for other dtypes)."""
+    if s.dtype.kind == "f":
+        return np.isinf(s.to_numpy(dtype=float, na_value=np.nan))
+    if s.dtype == object:
+        vals = s.to_numpy()
+        return (vals == np.inf) | (vals == -np.inf)
+    return None
+
+
+def _json_cells(s: pd.Series) -> np.ndarray:
+    """One column as Python objects, with NaN/NaT/NA/±Inf replaced with None in a single masked write."""
+    if s.dtype.kind == "f":
+        vals = s.to_numpy(dtype=float, na_value=np.nan)
+        out = vals.astype(object)
+        out[~np.isfinite(vals)] = None
+        return out
+    out = s.astype(object).to_numpy()
+    bad = pd.isna(out)
+    inf = _inf_mask(s)
+    if inf is not None:
+        bad |= inf
+    out[bad] = None
+    return out
+
+
+def head_records(df: pd.DataFrame, n: int = 1000) -> List[Dict[str, Any]]:
+    """First n rows as list-of-dicts, with NaN/NaT/NA/Inf replaced with None for JSON safety."""
+    head = df.head(n).reset_index(drop=True)
+
+    if _HAS_PYARROW and head.columns.is_unique and all(isinstance(c, str) for c in head.columns):
+        # ±Inf -> NaN first; Arrow then turns every missing value into null in one pass
+        for c in head.columns:
+            inf = _inf_mask(head[c])
+            if inf is not None and inf.any():
+                head[c] = head[c].mask(inf)
+        try:
+            return pa.Table.from_pandas(head, preserve_index=False).to_pylist()
+        except Exception as e:  # mixed-type object columns, exotic extension dtypes
+            log.debug("[HEAD_ARROW_SKIP] %s", e)
+
+    # Per column: one vectorized None-replacement, then rows are zipped straight into dicts
+    names = list(head.columns)
+    cells = [_json_cells(head.iloc[:, i]) for i in range(len(names))]
+    return [dict(zip(names, row)) for row in zip(*cells)]
+
+
+def _is_match_all(rx: re.Pattern) -> bool:
+    """`^.*$` without MULTILINE/DOTALL: exactly one whole-cell match for any single-line cell."""
+    return rx.pattern == "^.*$" and not rx.flags & (re.MULTILINE | re.DOTALL)
+
+
+def _count_matches(s: pd.Series, rx: re.Pattern) -> np.ndarray:
+    """Per-row count of non-overlapping rx matches (0 for NA); each distinct value is scanned once."""
+    if _is_match_all(rx):
+        strs = _to_string(s)
+        counts = strs.notna().to_numpy(dtype=np.int64)
+        # Only multi-line cells need the real regex
+        multi = _bool_array(strs.str.contains("\n", regex=False))
+        if multi.any():
+            cells = strs[multi].to_numpy(dtype=object)
+            counts[multi] = np.fromiter((len(rx.findall(v)) for v in cells), dtype=np.int64, count=len(cells))
+        return counts
+    codes, uniques = pd.factorize(_to_string(s).to_numpy(dtype=object, na_value=None))
+    ucounts = np.fromiter((len(rx.findall(u)) for u in uniques), dtype=np.int64, count=len(uniques))
+    # NA codes are -1, which picks the trailing 0
+    return np.append(ucounts, 0)[codes]
+
+
+@functools.lru_cache(maxsize=256)
+def _re2_pattern(pattern: str, flags: int) -> Optional[str]:
+    """
+    RE2 spelling of a Python regex for Arrow's match_substring_regex, or None when
+    RE2 could match differently (non-ASCII, unicode classes other than \\d, `$`, `{,n}`).
+    Syntax RE2 lacks (lookarounds, backrefs) makes the kernel raise, and callers fall back.
+    """
+    if flags & ~(re.IGNORECASE | re.UNICODE) or not pattern.isascii() or "{," in pattern:
+        return None
+    # re.I folds i/I with U+0130/U+0131 (Turkish dotted/dotless i), RE2 does not; it is the
+    # only ASCII letter where the two differ. Classes could hold i/I via ranges, so skip those too.
+    if flags & re.IGNORECASE and ("i" in pattern or "I" in pattern or "[" in pattern):
+        return None
+    out: List[str] = []
+    pos = 0
+    for m in re.finditer(r"\\(.)", pattern, re.S):
+        lit = pattern[pos:m.start()]
+        if "$" in lit:
+            return None
+        out.append(lit)
+        ch = m.group(1)
+        if ch == "d":
+            out.append(r"\p{Nd}")  # Python's \d is any Unicode decimal digit
+        elif ch == "D":
+            out.append(r"\P{Nd}")
+        elif ch in "tnr" or not ch.isalnum():
+            out.append(m.group(0))
+        else:
+            return None
+        pos = m.end()
+    if "$" in pattern[pos:]:
+        return None
+    out.append(pattern[pos:])
+    return "".join(out)
+
+
+def _contains_block(cols: Dict[Any, pd.Series], pos: np.ndarray, rx: re.Pattern) -> Optional[Dict[Any, np.ndarray]]:
+    """
+    Per-column `rx.search` hits at row positions `pos`, from a single Arrow regex kernel
+    run over all columns' buffers. None when Arrow strings or an RE2-safe pattern are unavailable.
+    """
+    if not _HAS_PYARROW or not cols:
+        return None
+    if not all(isinstance(ser.dtype, pd.StringDtype) and ser.dtype.storage == "pyarrow" for ser in cols.values()):
+        return None
+    re2 = _re2_pattern(rx.pattern, rx.flags)
+    if re2 is None:
+        return None
+    try:
+        chunks = []
+        for ser in cols.values():
+            arr = pa.array(ser.iloc[pos].array)
+            chunks.extend(arr.chunks if isinstance(arr, pa.ChunkedArray) else [arr])
+        block = pa.chunked_array(chunks, type=chunks[0].type)
+        hit = pc.match_substring_regex(block, pattern=re2, ignore_case=bool(rx.flags & re.IGNORECASE))
+        hit = pc.fill_null(hit, False).to_numpy(zero_copy_only=False).astype(bool, copy=False)
+    except Exception as e:  # RE2 rejects lookarounds, backrefs, ...
+        log.debug("[ARROW_CONTAINS_SKIP] %s", e)
+        return None
+    return dict(zip(cols, np.split(hit, np.arange(1, len(cols)) * len(pos))))
+
+
+def _bool_array(s: pd.Series) -> np.ndarray:
+    """Plain numpy bool mask from a (possibly nullable) boolean Series; NA -> False."""
+    return s.to_numpy(dtype=bool, na_value=False)
+
+
+def _index_ints(index: pd.Index) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Index labels as int64 plus a per-position 'is an int' flag, computed once per request.
+    Integer indexes convert in bulk; anything else goes through int() per label.
+    """
+    arr = np.asarray(index)
+    if arr.dtype.kind in "iu":
+        return arr.astype(np.int64, copy=False), np.ones(len(arr), dtype=bool)
+    vals = np.zeros(len(arr), dtype=np.int64)
+    ok = np.zeros(len(arr), dtype=bool)
+    for i, lbl in enumerate(arr):
+        try:
+            vals[i] = int(lbl)
+            ok[i] = True
+        except Exception:
+            pass
+    if not ok.all():
+        log.debug("[INDEX_LABEL_SKIP] %d non-integer index label(s), e.g. %s", int((~ok).sum()), arr[~ok][:5].tolist())
+    return vals, ok
+
+
+def _int_labels_at(vals: np.ndarray, ok: np.ndarray, pos: np.ndarray) -> List[int]:
+    """Int labels at the given row positions, skipping non-integer labels."""
+    return vals[pos[ok[pos]]].tolist()
+
+
+def _sorted_int_labels(vals: np.ndarray, ok: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Sorted distinct int labels of the rows flagged in a positional bool bitmap."""
+    return np.unique(vals[rows & ok])
+
+
 def _to_numeric(s: pd.Series) -> pd.Series:
     """Coerce a Series to numeric (NaN on failure)."""
     return pd.to_numeric(s, errors="coerce")
 
 
 # Clause parsers (fallbacks)
-def _mask_from_clauses(df: pd.DataFrame, q: str) -> Optional[pd.Series]:
+# `col` == 'value'
+_EQ_STR_RE = re.compile(r'`([^`]+)`\s*==\s*([\'"])(.*?)\2')
+# `col` >= 123 / > / <= / <
+_NUM_CMP_RE = re.compile(r'`([^`]+)`\s*(>=|<=|>|<)\s*([0-9]+(?:\.[0-9]+)?)')
+# .str.* ops (with optional astype, optional case/na)
+_STR_OP_RE = re.compile(
+    r'`(?P<col>[^`]+)`\s*'
+    r'(?:\.astype\(\s*(?:str|["\'](?:str|string)["\'])\s*\))?\s*'
+    r'\.str\.(?P<op>contains|match|fullmatch|startswith|endswith)\('
+    r'\s*r?(?P<q>["\'])(?P<pat>.*?)(?P=q)'
+    r'(?:\s*,\s*case\s*=\s*(?P<case>True|False))?'
+    r'(?:\s*,\s*na\s*=\s*(?P<na>True|False))?'
+    r'\s*\)',
+    re.I
+)
+
+
+def _mask_from_clauses(df: pd.DataFrame, q: str) -> Optional[np.ndarray]:
     """
     Best-effort AND-only clause parser. If nothing is recognized, return None.
     Supported:
@@ -119,21 +380,27 @@ def _mask_from_clauses(df: pd.DataFrame, q: str) -> Optional[pd.Series]:
       - `col`.str.endswith('suffix', na=?)
       - Optional `.astype(str|"str"|"string")` before `.str.*` is supported.
     NOTE: This parser ANDs all recognized clauses. OR must be handled by a higher-level splitter.
+    Masks are positional numpy bool arrays (len(df)); only _ensure_mask_from_query wraps them in a Series.
     """
-    mask: Optional[pd.Series] = None
+    mask: Optional[np.ndarray] = None
 
-    def _and(acc: Optional[pd.Series], cur: pd.Series) -> pd.Series:
-        return cur if acc is None else (acc & cur)
+    def _and(acc: Optional[np.ndarray], cur: pd.Series) -> np.ndarray:
+        cur = _bool_array(cur)
+        return cur if acc is None else np.logical_and(acc, cur)
 
-    # Equality compare with string literal (case-insensitive)
-    for col, quote, val in re.findall(r'`([^`]+)`\s*==\s*([\'"])(.*?)\2', q):
+    # Equality compare with string literal (case-insensitive), one scan per column
+    eq_by_col: Dict[str, List[str]] = {}
+    for col, quote, val in _EQ_STR_RE.findall(q):
         if col in df.columns:
-            s = _to_string(df[col])
-            cur = s.str.casefold().eq(val.casefold()).fillna(False)
-            mask = _and(mask, cur)
+            eq_by_col.setdefault(col, []).append(val)
+    for col, vals in eq_by_col.items():
+        # casefold (not re.I) so e.g. "straße" == "STRASSE" still holds; fold the column once
+        folded = _to_string(df[col]).str.casefold()
+        for v in dict.fromkeys(vals):
+            mask = _and(mask, folded.eq(v.casefold()).fillna(False))
 
     # Numeric comparisons
-    for col, op, val in re.findall(r'`([^`]+)`\s*(>=|<=|>|<)\s*([0-9]+(?:\.[0-9]+)?)', q):
+    for col, op, val in _NUM_CMP_RE.findall(q):
         if col in df.columns:
             s = _to_numeric(df[col])
             if op == '>=':
@@ -147,18 +414,7 @@ def _mask_from_clauses(df: pd.DataFrame, q: str) -> Optional[pd.Series]:
             mask = _and(mask, cur)
 
     # Unified pattern for .str.* ops (with optional astype, optional case/na)
-    str_op_pat = re.compile(
-        r'`(?P<col>[^`]+)`\s*'
-        r'(?:\.astype\(\s*(?:str|["\'](?:str|string)["\'])\s*\))?\s*'
-        r'\.str\.(?P<op>contains|match|fullmatch|startswith|endswith)\('
-        r'\s*r?(?P<q>["\'])(?P<pat>.*?)(?P=q)'
-        r'(?:\s*,\s*case\s*=\s*(?P<case>True|False))?'
-        r'(?:\s*,\s*na\s*=\s*(?P<na>True|False))?'
-        r'\s*\)',
-        re.I
-    )
-
-    for m in str_op_pat.finditer(q):
+    for m in _STR_OP_RE.finditer(q):
         col = m.group("col")
         op = m.group("op").lower()
         pat = m.group("pat")
@@ -171,36 +427,49 @@ def _mask_from_clauses(df: pd.DataFrame, q: str) -> Optional[pd.Series]:
         case = False if case_s == "" else (case_s == "true")
         na = False if na_s == "" else (na_s == "true")
 
-        s = _to_string(df[col])
-        try:
+        def _eval_op(s: pd.Series) -> pd.Series:
+            if op == "startswith":
+                return s.str.startswith(pat if case else pat.lower(), na=na).fillna(False)
+            if op == "endswith":
+                return s.str.endswith(pat if case else pat.lower(), na=na).fillna(False)
             if op == "contains":
-                cur = s.str.contains(pat, case=case, na=na).fillna(False)
-            elif op == "match":
-                cur = s.str.match(pat, case=case, na=na).fillna(False)
-            elif op == "fullmatch":
-                cur = s.str.fullmatch(pat, case=case, na=na).fillna(False)
-            elif op == "startswith":
-                if case:
-                    cur = s.str.startswith(pat, na=na).fillna(False)
-                else:
-                    cur = s.str.lower().str.startswith(pat.lower(), na=na).fillna(False)
-            else:  # endswith
-                if case:
-                    cur = s.str.endswith(pat, na=na).fillna(False)
-                else:
-                    cur = s.str.lower().str.endswith(pat.lower(), na=na).fillna(False)
-            mask = _and(mask, cur)
+                return s.str.contains(pat, case=case, na=na).fillna(False)
+            if op == "match":
+                return s.str.match(pat, case=case, na=na).fillna(False)
+            return s.str.fullmatch(pat, case=case, na=na).fillna(False)
+
+        if op in ("startswith", "endswith"):
+            # Case-insensitive prefix/suffix compares lower() on both sides, not re.I/RE2 folding
+            # ("İ".lower() is "i̇", and "ı" stays dotless); Python-backed strings lower like str.lower
+            s = _to_string(df[col]) if case else df[col].astype("string").str.lower()
+        else:
+            s = _regex_strings(df[col], pat, case)
+        try:
+            cur = _eval_op(s)
         except Exception:
+            # Arrow kernels can reject input Python's re accepts; retry on Python-backed strings
+            try:
+                cur = _eval_op(df[col].astype("string")) if s.dtype.storage == "pyarrow" else None
+            except Exception:
+                cur = None
+        if cur is None:
             # If any op errors, we simply skip that clause
-            print(f"[CLAUSE_EVAL_SKIP] failed to eval .str.{op} on column: {col}")
+            log.debug("[CLAUSE_EVAL_SKIP] failed to eval .str.%s on column: %s", op, col)
             continue
+        mask = _and(mask, cur)
 
     return mask
 
 
 def _has_string_equality(q: str) -> bool:
     """Detect if expression contains any `col == 'literal'` string equalities."""
-    return bool(re.search(r'`[^`]+`\s*==\s*([\'"])(.*?)\1', q))
+    return bool(_EQ_STR_RE.search(q))
+
+
+@functools.lru_cache(maxsize=8)
+def _split_scan_re(word: str) -> re.Pattern:
+    """Tokens _split_top_level cares about: escapes, quotes, parens and the whole-word keyword."""
+    return re.compile(rf'\\.|["\'()]|\b{word}\b', re.I | re.S)
 
 
 def _split_top_level(expr: str, word: str = "or") -> List[str]:
@@ -208,39 +477,109 @@ def _split_top_level(expr: str, word: str = "or") -> List[str]:
     Split an expression by a top-level logical word (default 'or'), respecting quotes and parentheses.
     Returns non-empty trimmed parts.
     """
+    scan = _split_scan_re(word)
+    # Nothing to track (no quotes, parens or escapes): every keyword is top-level
+    if not any(ch in expr for ch in "'\"()\\"):
+        return [p for p in (part.strip() for part in scan.split(expr)) if p]
+
     out: List[str] = []
-    buf: List[str] = []
     depth = 0
     in_s, in_d = False, False
-    i, n = 0, len(expr)
-
-    while i < n:
-        ch = expr[i]
-        # Escapes inside quotes
-        if ch == "\\" and i + 1 < n:
-            buf.append(expr[i:i+2]); i += 2; continue
-        if not in_d and ch == "'":
-            in_s = not in_s; buf.append(ch); i += 1; continue
-        if not in_s and ch == '"':
-            in_d = not in_d; buf.append(ch); i += 1; continue
-        if not in_s and not in_d:
-            if ch == "(":
-                depth += 1
-            elif ch == ")" and depth > 0:
+    last = 0
+
+    for m in scan.finditer(expr):
+        tok = m.group()
+        if tok[0] == "\\":
+            continue
+        if tok == "'":
+            if not in_d:
+                in_s = not in_s
+        elif tok == '"':
+            if not in_s:
+                in_d = not in_d
+        elif in_s or in_d:
+            continue
+        elif tok == "(":
+            depth += 1
+        elif tok == ")":
+            if depth > 0:
                 depth -= 1
-            m = re.match(rf'(?i)\b{word}\b', expr[i:])
-            if depth == 0 and m:
-                out.append("".join(buf).strip()); buf = []
-                i += m.end()
-                continue
-        buf.append(ch); i += 1
-
-    out.append("".join(buf).strip())
+        elif depth == 0:
+            out.append(expr[last:m.start()].strip())
+            last = m.end()
+
+    out.append(expr[last:].strip())
     return [p for p in out if p]
 
 
 # Query evaluators
-def _eval_basic_query(df: pd.DataFrame, q: str) -> Tuple[pd.Series, str, str]:
+def _log_rows(path: str, df: pd.DataFrame, mask: Any) -> None:
+    """Debug-log a row-filter result; the sum/head are only computed when DEBUG is on."""
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("[ROW_FILTER_RESULT] path=%s, rows=%d/%d, indices_head=%s",
+                  path, int(mask.sum()), len(df), list(df.index[mask][:10]))
+
+
+_AND_WORD_RE = re.compile(r'(?i)\band\b')
+_OR_WORD_RE = re.compile(r'(?i)\bor\b')
+
+# Clauses where _mask_from_clauses gives the same answer df.query would end up with:
+# numeric comparisons and .str.contains/.match/.fullmatch with an explicit case=.
+# Holds because _regex_strings only hands RE2 the patterns it reads exactly as Python re
+# (case-insensitive i/I and classes stay on re), checked against df.query in the tests.
+_SIMPLE_CLAUSE_RE = re.compile(
+    r'\s*`[^`]+`\s*(?:'
+    r'(?:>=|<=|>|<)\s*[0-9]+(?:\.[0-9]+)?'
+    r'|(?:\.astype\(\s*(?:str|["\'](?:str|string)["\'])\s*\))?\s*'
+    r'\.str\.(?:contains|match|fullmatch)\(\s*r?(?P<q>["\'])(?:(?!(?P=q))[^`\n])*(?P=q)'
+    r'\s*,\s*case\s*=\s*(?:True|False)(?:\s*,\s*na\s*=\s*(?:True|False))?\s*\)'
+    r')'
+)
+# `col` == 'literal' (no escapes inside the literal)
+_SIMPLE_EQ_CLAUSE_RE = re.compile(r'\s*`(?P<col>[^`]+)`\s*==\s*(?P<q>["\'])(?P<val>(?:(?!(?P=q))[^\\\n])*)(?P=q)')
+_SIMPLE_JOIN_RE = re.compile(r'\s*(?:&|(?i:and)\b)')
+
+
+def _and_chain(q: str, clause_rx: re.Pattern) -> Optional[List[re.Match]]:
+    """Clause matches if q is only clause_rx clauses joined by &/and (no parens, no OR), else None."""
+    out: List[re.Match] = []
+    pos = 0
+    while True:
+        m = clause_rx.match(q, pos)
+        if not m:
+            return None
+        out.append(m)
+        pos = m.end()
+        j = _SIMPLE_JOIN_RE.match(q, pos)
+        if not j:
+            return out if not q[pos:].strip() else None
+        pos = j.end()
+
+
+def _is_simple_and_expr(q: str) -> bool:
+    """True if q is only _SIMPLE_CLAUSE_RE clauses joined by &/and."""
+    return _and_chain(q, _SIMPLE_CLAUSE_RE) is not None
+
+
+def _exact_eq_mask(df: pd.DataFrame, q: str) -> Optional[np.ndarray]:
+    """
+    df.query's answer for an AND of `col` == 'literal' clauses, computed as plain
+    column comparisons. None if q has any other shape or names an unknown column.
+    """
+    clauses = _and_chain(q, _SIMPLE_EQ_CLAUSE_RE)
+    if clauses is None:
+        return None
+    mask: Optional[np.ndarray] = None
+    for m in clauses:
+        col = m.group("col")
+        if col not in df.columns or not isinstance(df[col], pd.Series):
+            return None
+        cur = _bool_array(df[col] == m.group("val"))
+        mask = cur if mask is None else np.logical_and(mask, cur)
+    return mask
+
+
+def _eval_basic_query(df: pd.DataFrame, q: str) -> Tuple[np.ndarray, str, str]:
     """
     Evaluate a single expression using:
       1) df.query(q, engine="python")
@@ -249,51 +588,72 @@ def _eval_basic_query(df: pd.DataFrame, q: str) -> Tuple[pd.Series, str, str]:
 
     Returns (mask, path_tag, used_query_or_hint).
     """
+    has_eq = _has_string_equality(q)
+
+    # Plain AND of clauses the fallback parser fully understands: skip df.query's parse/compile
+    if _is_simple_and_expr(q):
+        m = _mask_from_clauses(df, q)
+        if m is not None:
+            _log_rows("clauses_direct", df, m)
+            return m, "clauses_direct", q
+
+    # AND of string equalities: exact compare (what df.query does), CI clause parser on zero hits
+    if has_eq:
+        mask = _exact_eq_mask(df, q)
+        if mask is not None:
+            if not mask.any():
+                m_ci = _mask_from_clauses(df, q)
+                if m_ci is not None:
+                    _log_rows("eq_direct_zero_and_fallback", df, m_ci)
+                    return m_ci, "eq_direct_zero_and_fallback", q
+            _log_rows("eq_direct", df, mask)
+            return mask, "eq_direct", q
+
     # As-is
     try:
         idx = df.query(q, engine="python").index
-        mask = df.index.to_series().isin(idx)
-        if int(mask.sum()) == 0 and _has_string_equality(q):
+        mask = df.index.isin(idx)
+        if has_eq and not mask.any():
             # Zero-hit but expression contains string equalities -> try CI fallback
             m_ci = _mask_from_clauses(df, q)
             if m_ci is not None:
-                print(f"[ROW_FILTER_RESULT] path=query_zero_and_fallback, rows={int(m_ci.sum())}/{len(df)}, indices_head={list(df.index[m_ci][:10])}")
+                _log_rows("query_zero_and_fallback", df, m_ci)
                 return m_ci, "query_zero_and_fallback", q
-        print(f"[ROW_FILTER_RESULT] path=query, rows={int(mask.sum())}/{len(df)}, indices_head={list(idx[:10])}")
+        _log_rows("query", df, mask)
         return mask, "query", q
     except Exception as e1:
-        print(f"[ROW_FILTER_QUERY_FAIL_1] {e1} -> retry with &/|")
+        log.debug("[ROW_FILTER_QUERY_FAIL_1] %s -> retry with &/|", e1)
 
     # with &/| rewrite
-    rew = re.sub(r'(?i)\bor\b', '|', re.sub(r'(?i)\band\b', '&', q))
+    rew = _OR_WORD_RE.sub('|', _AND_WORD_RE.sub('&', q))
     try:
         idx = df.query(rew, engine="python").index
-        mask = df.index.to_series().isin(idx)
-        if int(mask.sum()) == 0 and _has_string_equality(q):
+        mask = df.index.isin(idx)
+        if has_eq and not mask.any():
             # Zero-hit after rewrite -> try CI fallback
             m_ci = _mask_from_clauses(df, q)
             if m_ci is not None:
-                print(f"[ROW_FILTER_RESULT] path=query_rewrite_zero_and_fallback, rows={int(m_ci.sum())}/{len(df)}, indices_head={list(df.index[m_ci][:10])}")
-                print(f"[ROW_FILTER_QUERY_REWRITE] {rew}")
+                _log_rows("query_rewrite_zero_and_fallback", df, m_ci)
+                log.debug("[ROW_FILTER_QUERY_REWRITE] %s", rew)
                 return m_ci, "query_rewrite_zero_and_fallback", rew
-        print(f"[ROW_FILTER_RESULT] path=query_rewrite, rows={int(mask.sum())}/{len(df)}, indices_head={list(idx[:10])}")
-        print(f"[ROW_FILTER_QUERY_REWRITE] {rew}")
+        _log_rows("query_rewrite", df, mask)
+        log.debug("[ROW_FILTER_QUERY_REWRITE] %s", rew)
         return mask, "query_rewrite", rew
     except Exception as e2:
-        print(f"[ROW_FILTER_QUERY_FAIL_2] {e2} -> fallback AND-clauses")
+        log.debug("[ROW_FILTER_QUERY_FAIL_2] %s -> fallback AND-clauses", e2)
 
     # AND-only fallback (CI for string equality and full `.str.*` ops)
     m = _mask_from_clauses(df, q)
     if m is not None:
-        print(f"[ROW_FILTER_RESULT] path=fallback_and, rows={int(m.sum())}/{len(df)}, indices_head={list(df.index[m][:10])}")
+        _log_rows("fallback_and", df, m)
         return m, "fallback_and", q
 
     # Nothing recognized: all True to avoid breaking the pipeline
-    print("[ROW_FILTER_FALLBACK_ALL_TRUE] nothing recognized (single expression)")
-    return pd.Series(True, index=df.index), "all_false", q
+    log.debug("[ROW_FILTER_FALLBACK_ALL_TRUE] nothing recognized (single expression)")
+    return np.ones(len(df), dtype=bool), "all_false", q
 
 
-def _mask_from_expr_with_or(df: pd.DataFrame, q: str) -> Optional[pd.Series]:
+def _mask_from_expr_with_or(df: pd.DataFrame, q: str) -> Optional[np.ndarray]:
     """
     OR-aware evaluator (without rownum):
       - Split by top-level OR into parts
@@ -306,7 +666,7 @@ def _mask_from_expr_with_or(df: pd.DataFrame, q: str) -> Optional[pd.Series]:
         m, _path, _used = _eval_basic_query(df, q)
         return m
 
-    acc: Optional[pd.Series] = None
+    acc: Optional[np.ndarray] = None
     any_part = False
     for part in parts:
         part = part.strip() or "True"
@@ -337,7 +697,7 @@ def _remove_rownum_clauses(expr: str) -> Tuple[str, List[int]]:
         try:
             rownums.append(int(m.group(1)))
         except Exception:
-            print(f"[ROWNUM_PARSE_FAIL] invalid rownum: {m.group(1)}")
+            log.debug("[ROWNUM_PARSE_FAIL] invalid rownum: %s", m.group(1))
             pass
         return " True "  # keep boolean structure valid
 
@@ -345,7 +705,7 @@ def _remove_rownum_clauses(expr: str) -> Tuple[str, List[int]]:
     return expr_wo, rownums
 
 
-def _mask_group_with_rownum(df: pd.DataFrame, group_expr: str) -> Tuple[pd.Series, str]:
+def _mask_group_with_rownum(df: pd.DataFrame, group_expr: str) -> Tuple[np.ndarray, str]:
     """
     Evaluate one OR group possibly containing a rownum clause.
     Semantics:
@@ -356,56 +716,56 @@ def _mask_group_with_rownum(df: pd.DataFrame, group_expr: str) -> Tuple[pd.Serie
     """
     expr_wo_rn, rownums = _remove_rownum_clauses(group_expr)
     expr_wo_rn = (expr_wo_rn or "").strip() or "True"
+    # 1-based row numbers -> positions; out-of-range ones pick nothing (and may not fit in int64)
+    rn = np.asarray([n - 1 for n in rownums if 1 <= n <= len(df)], dtype=np.int64)
 
     base_mask, path, used = _eval_basic_query(df, expr_wo_rn)
 
     # No rownum in this group -> just the base mask
     if not rownums:
-        print(f"[ROW_FILTER_GROUP_PATH] {path} :: '{group_expr}'")
+        log.debug("[ROW_FILTER_GROUP_PATH] %s :: '%s'", path, group_expr)
         return base_mask, path
 
     # Rownum only (expr reduced to True) -> pick global rows
     if expr_wo_rn.lower() == "true":
-        picks = []
         n_rows = len(df)
-        for n in rownums:
-            pos = n - 1
-            if 0 <= pos < n_rows:
-                picks.append(df.index[pos])
-        out_mask = df.index.to_series().isin(picks) if picks else pd.Series(False, index=df.index)
-        print(f"[ROWNUM_GLOBAL_ONLY] ns={rownums} -> rows={int(out_mask.sum())}")
-        print(f"[ROW_FILTER_GROUP_PATH] rownum_only :: '{group_expr}'")
-        return out_mask, "rownum_only"
+        m = np.zeros(n_rows, dtype=bool)
+        m[rn] = True
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("[ROWNUM_GLOBAL_ONLY] ns=%s -> rows=%d", rownums, int(m.sum()))
+        log.debug("[ROW_FILTER_GROUP_PATH] rownum_only :: '%s'", group_expr)
+        return m, "rownum_only"
 
     # Rownum WITHIN the group's base set
-    idxs = list(df.index[base_mask])
-    picks = []
-    for n in rownums:
-        pos = n - 1
-        if 0 <= pos < len(idxs):
-            picks.append(idxs[pos])
-    out_mask = df.index.to_series().isin(picks) if picks else pd.Series(False, index=df.index)
-    print(f"[ROWNUM_WITHIN_GROUP] ns={rownums}, base_rows={len(idxs)}, selected_count={int(out_mask.sum())}")
-    print(f"[ROW_FILTER_GROUP_PATH] {path}+rownum :: '{group_expr}'")
-    return out_mask, f"{path}+rownum"
+    idxs = np.flatnonzero(base_mask)
+    m = np.zeros(len(df), dtype=bool)
+    m[idxs[rn[rn < len(idxs)]]] = True
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("[ROWNUM_WITHIN_GROUP] ns=%s, base_rows=%d, selected_count=%d", rownums, len(idxs), int(m.sum()))
+    log.debug("[ROW_FILTER_GROUP_PATH] %s+rownum :: '%s'", path, group_expr)
+    return m, f"{path}+rownum"
 
 
-def _mask_from_query_with_rownum(df: pd.DataFrame, norm: str) -> pd.Series:
+def _mask_from_query_with_rownum(df: pd.DataFrame, norm: str) -> np.ndarray:
     """
     Evaluate the full (possibly OR-ed) expression, honoring __rownum__ inside each OR group.
     Final mask is the OR-union of per-group masks.
     """
     parts = _split_top_level(norm, "or") or [norm]
-    acc: Optional[pd.Series] = None
+    acc: Optional[np.ndarray] = None
     for part in parts:
         m, tag = _mask_group_with_rownum(df, part)
         acc = m if acc is None else (acc | m)
     if acc is None:
-        return pd.Series(True, index=df.index)
+        return np.ones(len(df), dtype=bool)
     return acc
 
 
 # Main row-filter builder
+# Whole query is a single `col` == 'value' condition
+_SOFT_EQ_RE = re.compile(r"""\s*`?([A-Za-z0-9_ ]+)`?\s*==\s*['"](.+?)['"]\s*""")
+
+
 def _ensure_mask_from_query(df: pd.DataFrame, query: Optional[str]) -> pd.Series:
     """
     Build a boolean mask from a pandas query-like string, with **per-OR-group row-number semantics**.
@@ -423,17 +783,14 @@ def _ensure_mask_from_query(df: pd.DataFrame, query: Optional[str]) -> pd.Series
         return pd.Series(True, index=df.index)
 
     norm = _normalize_row_filter(query, df.columns)
-    print(f"[ROW_FILTER_NORMALIZED] {norm}")
+    log.debug("[ROW_FILTER_NORMALIZED] %s", norm)
 
-    mask = _mask_from_query_with_rownum(df, norm)
-    print(f"[ROW_FILTER_RESULT] path=or_groups, rows={int(mask.sum())}/{len(df)}, indices_head={list(df.index[mask][:10])}")
+    mask = pd.Series(_mask_from_query_with_rownum(df, norm), index=df.index, copy=False)
+    _log_rows("or_groups", df, mask)
 
     # soft-recall guess when the entire query is a single column == 'value' condition
     if mask.sum() == 0:
-        m = re.fullmatch(
-            r"""\s*`?([A-Za-z0-9_ ]+)`?\s*==\s*['"](.+?)['"]\s*""",
-            str(query)
-        )
+        m = _SOFT_EQ_RE.fullmatch(str(query))
         if m:
             col, val = m.group(1).strip(), m.group(2)
             if col in df.columns:
@@ -446,6 +803,14 @@ def _ensure_mask_from_query(df: pd.DataFrame, query: Optional[str]) -> pd.Series
 
 # Display-regex extraction
 _MATCH_ALL_RE = re.compile(r'^\s*\^?\.\*\$?\s*$')
+_ESCAPED_SPACE_RE = re.compile(r'\\\s+')
+# .astype(...)? followed by .str.contains/.match/.fullmatch/.startswith/.endswith('value', ...)
+_STR_OP_DISPLAY_RE = re.compile(
+    r'`([^`]+)`\s*'
+    r'(?:\.astype\(\s*(?:str|["\'](?:str|string)["\'])\s*\))?\s*'
+    r'\.str\.(contains|match|fullmatch|startswith|endswith)\('
+    r'\s*([\'"])(.*?)\2.*?\)'
+)
 
 
 def _loose_token_regex(token: str) -> str:
@@ -455,7 +820,7 @@ def _loose_token_regex(token: str) -> str:
       - Allow flexible separators for spaces: ' ' -> '[-_.:/\\s]*'
     """
     esc = re.escape(token)
-    esc = re.sub(r'\\\s+', r'[-_.:/\\s]*', esc)
+    esc = _ESCAPED_SPACE_RE.sub(r'[-_.:/\\s]*', esc)
     return esc
 
 
@@ -468,19 +833,18 @@ def _display_regex_and_columns_from_row_filter(row_filter: Optional[str]) -> Tup
     """
     if not row_filter:
         return None, []
+    display_rx, cols = _display_regex_and_columns_cached(str(row_filter))
+    return display_rx, list(cols)
+
 
-    q = str(row_filter)
+@functools.lru_cache(maxsize=512)
+def _display_regex_and_columns_cached(q: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """Cached body of _display_regex_and_columns_from_row_filter (columns as a tuple so the cache can't be mutated)."""
     tokens: List[str] = []
     cols: List[str] = []
 
     # .astype(...)? followed by .str.contains/.match/.fullmatch/.startswith/.endswith('value', ...)
-    for col, op, _, val in re.findall(
-        r'`([^`]+)`\s*'
-        r'(?:\.astype\(\s*(?:str|["\'](?:str|string)["\'])\s*\))?\s*'
-        r'\.str\.(contains|match|fullmatch|startswith|endswith)\('
-        r'\s*([\'"])(.*?)\2.*?\)',
-        q
-    ):
+    for col, op, _, val in _STR_OP_DISPLAY_RE.findall(q):
         cols.append(col)
         if val:
             if op == "startswith":
@@ -494,13 +858,13 @@ def _display_regex_and_columns_from_row_filter(row_filter: Optional[str]) -> Tup
                 tokens.append(_loose_token_regex(val))
 
     # Equality with string literal
-    for col, _, val in re.findall(r'`([^`]+)`\s*==\s*([\'"])(.*?)\2', q):
+    for col, _, val in _EQ_STR_RE.findall(q):
         cols.append(col)
         if val:
             tokens.append(re.escape(val))
 
     # Numeric comparisons (columns only)
-    for col, _val in re.findall(r'`([^`]+)`\s*(?:>=|<=|>|<)\s*([0-9]+(?:\.[0-9]+)?)', q):
+    for col, _op, _val in _NUM_CMP_RE.findall(q):
         cols.append(col)
 
     # Deduplicate columns preserving order
@@ -508,10 +872,11 @@ def _display_regex_and_columns_from_row_filter(row_filter: Optional[str]) -> Tup
     cols = [c for c in cols if not (c in seen or seen.add(c))]
 
     if tokens:
-        display_rx = r'(?:' + '|'.join(tokens) + r')'
-        return display_rx, cols
+        # Repeated clauses yield repeated alternatives, which only add backtracking
+        display_rx = r'(?:' + '|'.join(dict.fromkeys(tokens)) + r')'
+        return display_rx, tuple(cols)
 
-    return None, cols
+    return None, tuple(cols)
 
 
 # Highlight helpers
@@ -522,6 +887,21 @@ def _highlight_html(text: Any, rx: re.Pattern) -> Tuple[str, int]:
     if text is None or (isinstance(text, float) and pd.isna(text)):
         return "", 0
     s = str(text)
+    if "\n" not in s and _is_match_all(rx):
+        return f"<mark>{html.escape(s)}</mark>", 1
+    if rx.search(s) is None:
+        return html.escape(s), 0
+    if not rx.groups:
+        # No capture groups: split/findall give the gaps and hits directly
+        segs = rx.split(s)
+        hits = rx.findall(s)
+        out = [html.escape(segs[0])]
+        for h, seg in zip(hits, segs[1:]):
+            out.append("<mark>")
+            out.append(html.escape(h))
+            out.append("</mark>")
+            out.append(html.escape(seg))
+        return "".join(out), len(hits)
     parts: List[str] = []
     last = 0
     count = 0
@@ -537,6 +917,14 @@ def _highlight_html(text: Any, rx: re.Pattern) -> Tuple[str, int]:
 
 
 # Main executor
+# __DATE_NORMALIZE__(...) option parsing
+_DATE_OPT_SPLIT_RE = re.compile(r"[;,]")
+_DATE_FMT_RE = re.compile(r"[YMDHms:/._\- ]+")
+_DAYFIRST_RE = re.compile(r"dayfirst\s*=\s*(auto|true|false)", re.I)
+# DATE_NORMALIZE patterns meaning "the whole cell" (exactly what r'^\^?\.\*\$?$' fullmatches)
+_WHOLE_CELL_PATTERNS = frozenset((".*", "^.*", ".*$", "^.*$"))
+
+
 def execute_plan(
     df: pd.DataFrame,
     intent: str,
@@ -556,6 +944,10 @@ def execute_plan(
     if (not pattern) and intent.lower() == "find":
         pattern = "^.*$"
     mask = _ensure_mask_from_query(df, row_filter)
+    mask_pos = np.flatnonzero(mask.to_numpy(dtype=bool))
+    idx_vals, idx_ok = _index_ints(df.index)
+    # Safer mask index export (ints only), shared by every branch's payload
+    mask_idx_ints = _int_labels_at(idx_vals, idx_ok, mask_pos[:2000])
 
     # choose base columns
     cols = _auto_columns(df, intent, pattern, columns)
@@ -637,39 +1029,54 @@ def execute_plan(
     if not use_pattern:
         use_pattern = "^.*$"
 
-    rx = re.compile(use_pattern, _compile_flags(flags))
+    rx = _get_rx(use_pattern, flags)
 
     # ---------- FIND ----------
     if intent.lower() == "find":
         total = 0
         per_col: Dict[str, int] = {}
-        changed_rows: set[int] = set()
-
-        # Count matches in masked rows only
-        for c in cols:
-            ser = _to_string(df.loc[mask, c])
-            counts = ser.str.count(rx).fillna(0)
+        changed_mask = np.zeros(len(df), dtype=bool)  # positional "row has a hit" bitmap
+
+        # Count matches in masked rows only (no effective row_filter: skip the boolean take)
+        sub = df[cols] if len(mask_pos) == len(df) else df.loc[mask, cols]
+        # Hit positions per column (examples only highlight these cells)
+        col_hit_pos: Dict[str, np.ndarray] = {}
+        for c, ser in sub.items():
+            counts = _count_matches(ser, rx)
             n = int(counts.sum())
             per_col[c] = n
             total += n
             if n:
-                for idx in counts[counts > 0].index:
-                    try:
-                        changed_rows.add(int(idx))
-                    except Exception:
-                        # Skip non-integer index labels
-                        print(f"[INDEX_LABEL_SKIP] non-integer index label: {idx}")
-                        pass
+                col_hit_pos[c] = mask_pos[counts > 0]
+                changed_mask[col_hit_pos[c]] = True
 
+        changed_rows = _sorted_int_labels(idx_vals, idx_ok, changed_mask)
         rows_with_hits = len(changed_rows)
 
         # Prepare up to 50 HTML-highlighted examples
         examples: List[Dict[str, Any]] = []
-        for ridx in sorted(changed_rows)[:50]:
+        example_rows = changed_rows[:50].tolist()
+        per_col_hits = {
+            c: set(np.intersect1d(idx_vals[hp[idx_ok[hp]]], example_rows).tolist())
+            for c, hp in col_hit_pos.items()
+        }
+        # One .loc for all example cells; fall back to df.at when labels aren't unique
+        ex_records: Optional[Dict[Any, Dict[str, Any]]] = None
+        if example_rows and df.index.is_unique and len(set(cols)) == len(cols):
+            try:
+                ex_records = df.loc[example_rows, cols].to_dict(orient="index")
+            except KeyError:
+                ex_records = None
+        for ridx in example_rows:
             ex: Dict[str, Any] = {"_index": int(ridx)}
             row_has_any = False
             for c in cols:
-                raw = df.at[ridx, c] if (ridx in df.index and c in df.columns) else None
+                if ridx not in per_col_hits.get(c, ()):
+                    continue
+                if ex_records is not None:
+                    raw = ex_records[ridx][c]
+                else:
+                    raw = df.at[ridx, c] if (ridx in df.index and c in df.columns) else None
                 html_text, cell_cnt = _highlight_html(raw, rx)
                 if cell_cnt > 0:
                     ex[c] = {"count": int(cell_cnt), "html": html_text}
@@ -678,28 +1085,12 @@ def execute_plan(
                 examples.append(ex)
 
         if row_filter_only_hits:
-            changed_rows = set()
-            for lbl in df.index[mask]:
-                try:
-                    changed_rows.add(int(lbl))
-                except Exception:
-                    print(f"[INDEX_LABEL_SKIP] non-integer index label in mask: {lbl}")
-                    pass
-            rows_with_hits = len(changed_rows)
-        else:
-            rows_with_hits = len(changed_rows)
-
-        head_hits = [i for i in sorted(changed_rows) if i < head_n]
-        print("head_hits:", head_hits)
+            changed_rows = _sorted_int_labels(idx_vals, idx_ok, mask.to_numpy(dtype=bool))
+        rows_with_hits = len(changed_rows)
 
-        # Safer mask index export (ints only)
-        mask_idx_ints: List[int] = []
-        for lbl in list(df.index[mask])[:2000]:
-            try:
-                mask_idx_ints.append(int(lbl))
-            except Exception:
-                print(f"[INDEX_LABEL_SKIP] non-integer index label in mask: {lbl}")
-                pass
+        head_hits = changed_rows[changed_rows < head_n].tolist()
+        top_rows = changed_rows[:2000].tolist()  # shared by changed_row_indices / result_rows_indices
+        log.debug("head_hits: %s", head_hits)
 
         result_rows_description = (
             "Result rows = rows where row_filter is true."
@@ -725,17 +1116,17 @@ def execute_plan(
                 "total_matches": total,
                 "per_column": per_col,
                 "rows_with_hits": rows_with_hits,
-                "changed_row_indices": [int(i) for i in sorted(changed_rows)[:2000]],
+                "changed_row_indices": top_rows,
                 "head_hit_row_indices": head_hits,
             },
             "examples": examples,
             "columns": list(cols),
-            "head": df.head(head_n).to_dict(orient="records"),
+            "head": head_records(df, head_n),
 
             # For UI
             "result_rows_description": result_rows_description,
             "result_rows_count": rows_with_hits,
-            "result_rows_indices": [int(i) for i in sorted(changed_rows)[:2000]],
+            "result_rows_indices": top_rows,
         }
         return df, payload
 
@@ -749,12 +1140,12 @@ def execute_plan(
         dayfirst_opt: Optional[bool] = None  # None=auto; True/False=explicit
 
         if inside:
-            parts = [p.strip() for p in re.split(r"[;,]", inside) if p.strip()]
+            parts = [p.strip() for p in _DATE_OPT_SPLIT_RE.split(inside) if p.strip()]
             for p in parts:
-                if re.fullmatch(r"[YMDHms:/._\- ]+", p):
+                if _DATE_FMT_RE.fullmatch(p):
                     out_fmt = p
                 elif p.lower().startswith("dayfirst"):
-                    m = re.search(r"dayfirst\s*=\s*(auto|true|false)", p, re.I)
+                    m = _DAYFIRST_RE.search(p)
                     if m:
                         val = m.group(1).lower()
                         if val == "true":
@@ -764,83 +1155,80 @@ def execute_plan(
                         else:
                             dayfirst_opt = None
 
-        # Columns + mask
+        # Columns
         cols = _auto_columns(df, intent, pattern, columns)
-        mask = _ensure_mask_from_query(df, row_filter)
+        # Every row selected (no row_filter): a full slice reads as a view and writes without a take
+        rows = slice(None) if len(mask_pos) == len(df) else mask_pos
 
         # Guess dayfirst if auto
         if dayfirst_opt is None:
             samples: List[str] = []
+            target = 200  # guess_dayfirst only reads the first 200 samples
             for c in cols:
-                ser = _to_string(df.loc[mask, c]).dropna()
-                samples.extend([str(x) for x in ser.head(200).tolist()])
+                if len(samples) >= target:
+                    break
+                # Take the rows first so only the sampled cells get cast to strings
+                ser = df.loc[mask, c].dropna().head(target - len(samples))
+                samples.extend(_to_string(ser).tolist())
             g = guess_dayfirst(samples)
             dayfirst_use = g if g is not None else False  # default to month-first if unsure
         else:
             dayfirst_use = dayfirst_opt
 
         # Execute (whole-cell or substring mode)
-        out = df.copy()
+        out = df.copy(deep=False)  # touched columns are replaced wholesale below
         total = 0
         per_col: Dict[str, int] = {}
-        changed_rows: set[int] = set()
+        changed_mask = np.zeros(len(df), dtype=bool)
 
-        whole_cell = bool(re.fullmatch(r'^\^?\.\*\$?$', pattern or ""))
+        whole_cell = (pattern or "") in _WHOLE_CELL_PATTERNS
 
-        for c in cols:
-            ser_all = out[c].astype("string")
-            target = ser_all.loc[mask]
+        def _normalize_column(c) -> Tuple[pd.Series, int, np.ndarray]:
+            """Normalize one string column in place; returns (column, changed count, touched row positions)."""
+            ser_all = cols_str[c]
+            target = ser_all.iloc[rows]
 
             if whole_cell:
-                def _apply_whole(val):
-                    new, cnt = normalize_cell_as_whole(val, out_fmt=out_fmt, dayfirst=dayfirst_use)
-                    return new, cnt
-
-                changed = 0
-                new_vals = []
-                for v in target.tolist():
-                    nv, cnt = _apply_whole(v)
-                    new_vals.append(nv)
-                    changed += cnt
-
-                per_col[c] = int(changed)
-                total += int(changed)
-                ser_all.loc[mask] = new_vals
-                out[c] = ser_all
-                if changed:
-                    changed_rows.update(target.index.tolist())
-            else:
-                rx_sub = re.compile(pattern or "^.*$", _compile_flags(flags))
-                hit_mask = _to_string(target).str.contains(rx_sub).fillna(False)
-                sub_index = target[hit_mask].index
-
-                changed = 0
-                new_vals = []
-                for v in target.loc[sub_index].tolist():
-                    s = "" if v is None else str(v)
-                    new_s, cnt = normalize_date_text(s, out_fmt=out_fmt, dayfirst=dayfirst_use)
-                    new_vals.append(new_s)
-                    changed += cnt
-
-                per_col[c] = int(changed)
-                total += int(changed)
-                ser_all.loc[sub_index] = new_vals
-                out[c] = ser_all
-                if changed:
-                    try:
-                        changed_rows.update(int(x) for x in sub_index)
-                    except Exception:
-                        print(f"[INDEX_LABEL_SKIP] non-integer index label in date normalize: {sub_index}")
-                        pass
-
-        # Safer mask index export (ints only)
-        mask_idx_ints: List[int] = []
-        for lbl in list(df.index[mask])[:2000]:
-            try:
-                mask_idx_ints.append(int(lbl))
-            except Exception:
-                print(f"[INDEX_LABEL_SKIP] non-integer index label in mask: {lbl}")
-                pass
+                new_vals, changed = normalize_series(target, out_fmt=out_fmt, dayfirst=dayfirst_use)
+                ser_all.iloc[rows] = new_vals.to_numpy()
+                return ser_all, int(changed), mask_pos
+
+            hit_rows = block_hits.get(c) if block_hits else None
+            if hit_rows is None:
+                # Pattern + flags rather than the compiled object: works for both string backends
+                hit_mask = target.str.contains(rx_sub.pattern, flags=rx_sub.flags).fillna(False)
+                hit_rows = hit_mask.to_numpy(dtype=bool)
+            hits = target[hit_rows]
+            hit_pos = mask_pos[hit_rows]
+
+            # Rewrite each distinct cell text once, then broadcast back through the codes
+            codes, uniques = pd.factorize(hits.to_numpy(dtype=object))
+            new_u = np.empty(len(uniques), dtype=object)
+            cnt_u = np.zeros(len(uniques), dtype=np.int64)
+            for i, v in enumerate(uniques):
+                new_u[i], cnt_u[i] = normalize_date_text(str(v), out_fmt=out_fmt, dayfirst=dayfirst_use)
+
+            ser_all.iloc[hit_pos] = new_u[codes]
+            return ser_all, int(cnt_u[codes].sum()), hit_pos
+
+        # A column listed twice shares one string Series, so normalize each label once.
+        # Plain loop: re, dateparser and strftime all hold the GIL, so threads would not overlap.
+        cols_str = _string_columns(out, cols)
+        uniq_cols = list(cols_str)
+        # Substring mode: find candidate cells of every column with one Arrow kernel when possible
+        rx_sub = None if whole_cell else _get_rx(pattern, flags)
+        block_hits = _contains_block(cols_str, mask_pos, rx_sub) if rx_sub is not None else None
+        results = {c: _normalize_column(c) for c in uniq_cols}
+
+        for c in cols:
+            ser_all, changed, touched = results[c]
+            per_col[c] = changed
+            total += changed
+            out[c] = ser_all
+            if changed:
+                changed_mask[touched] = True
+        changed_rows = _sorted_int_labels(idx_vals, idx_ok, changed_mask)
+        top_rows = changed_rows[:2000].tolist()  # shared by changed_row_indices / result_rows_indices
 
         payload = {
             "mode": "replace",
@@ -853,53 +1241,50 @@ def execute_plan(
             "mask_row_indices": mask_idx_ints,
             "replacements": int(total),
             "per_column": per_col,
-            "changed_row_indices": [int(i) for i in sorted(changed_rows)[:2000]],
-            "head_hit_row_indices": [i for i in sorted(changed_rows) if i < head_n],
-            "head": out.head(head_n).to_dict(orient="records"),
+            "changed_row_indices": top_rows,
+            "head_hit_row_indices": changed_rows[changed_rows < head_n].tolist(),
+            "head": head_records(out, head_n),
 
             "result_rows_description": (
                 "Result rows = rows where "
                 "row_filter is true AND at least one of the selected columns matches the pattern."
             ),
             "result_rows_count": len(changed_rows),
-            "result_rows_indices": [int(i) for i in sorted(changed_rows)[:2000]],
+            "result_rows_indices": top_rows,
         }
         return out, payload
 
     # ---------- PLAIN REPLACE ----------
     rep = "" if replacement is None else str(replacement)
-    out = df.copy()
+    out = df.copy(deep=False)  # touched columns are replaced wholesale below
     total = 0
     per_col: Dict[str, int] = {}
-    changed_rows: set[int] = set()
+    changed_mask = np.zeros(len(df), dtype=bool)
+    rows = slice(None) if len(mask_pos) == len(df) else mask_pos  # full slice when nothing is filtered
 
-    rx_replace = re.compile(use_pattern, _compile_flags(flags))
+    rx_replace = _get_rx(use_pattern, flags)
+    cols_str = _string_columns(out, cols)
 
     for c in cols:
-        col_all = out[c].astype("string")
-        s_mask = col_all.loc[mask]
-        before = s_mask.str.count(rx_replace).fillna(0)
-        n = int(before.sum())
+        col_all = cols_str[c]
+        s_mask = col_all.iloc[rows]
+        # One subn per distinct value gives both the rewritten text and the match count
+        codes, uniques = pd.factorize(s_mask.to_numpy(dtype=object, na_value=None))
+        new_u = np.empty(len(uniques) + 1, dtype=object)
+        cnt_u = np.zeros(len(uniques) + 1, dtype=np.int64)
+        for i, v in enumerate(uniques):
+            new_u[i], cnt_u[i] = rx_replace.subn(rep, v)
+        new_u[-1] = pd.NA  # NA codes are -1
+        counts = cnt_u[codes]
+        n = int(counts.sum())
         per_col[c] = n
         total += n
         if n:
-            col_all.loc[mask] = s_mask.str.replace(rx_replace, rep, regex=True)
+            col_all.iloc[rows] = new_u[codes]
             out[c] = col_all
-            for lbl in before[before > 0].index:
-                try:
-                    changed_rows.add(int(lbl))
-                except Exception:
-                    print(f"[INDEX_LABEL_SKIP] non-integer index label in replace: {lbl}")
-                    pass
-
-    # Safer mask index export (ints only)
-    mask_idx_ints: List[int] = []
-    for lbl in list(df.index[mask])[:2000]:
-        try:
-            mask_idx_ints.append(int(lbl))
-        except Exception:
-            print(f"[INDEX_LABEL_SKIP] non-integer index label in mask: {lbl}")
-            pass
+            changed_mask[mask_pos[counts > 0]] = True
+    changed_rows = _sorted_int_labels(idx_vals, idx_ok, changed_mask)
+    top_rows = changed_rows[:2000].tolist()  # shared by changed_row_indices / result_rows_indices
 
     payload = {
         "mode": "replace",
@@ -915,15 +1300,15 @@ def execute_plan(
         "mask_row_indices": mask_idx_ints,
         "replacements": total,
         "per_column": per_col,
-        "changed_row_indices": [int(i) for i in sorted(changed_rows)[:2000]],
-        "head_hit_row_indices": [i for i in sorted(changed_rows) if i < head_n],
-        "head": out.head(head_n).to_dict(orient="records"),
+        "changed_row_indices": top_rows,
+        "head_hit_row_indices": changed_rows[changed_rows < head_n].tolist(),
+        "head": head_records(out, head_n),
 
         "result_rows_description": (
                 "Result rows = rows where "
                 "row_filter is true AND at least one of the selected columns matches the pattern."
             ),
         "result_rows_count": len(changed_rows),
-        "result_rows_indices": [int(i) for i in sorted(changed_rows)[:2000]],
+        "result_rows_indices": top_rows,
     }
     return out, payload
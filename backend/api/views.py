@@ -1,10 +1,13 @@
 import os
 import re
 import uuid
+import logging
 from pathlib import Path
 import pandas as pd
 import numpy as np
 import math
+import threading
+from collections import OrderedDict
 from collections.abc import Mapping, Sequence
 
 from django.conf import settings
@@ -18,6 +21,16 @@ from django.db.models.functions import Lower
 
 from .models import UploadedFile
 from .utils.nl_execute import nl_execute
+from .utils.regex_executor import head_records
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    _HAS_PYARROW = True
+except Exception:
+    _HAS_PYARROW = False
+
+log = logging.getLogger(__name__)
 
 
 def next_unique_numeric_name(original_name: str, ext=".csv") -> str:
@@ -105,15 +118,65 @@ def _read_df(path: str):
     return df, False
 
 
-def _head_records(df: pd.DataFrame, n=1000):
-    """ Return first n rows as list-of-dicts, with NaN/NaT/Inf replaced with None for JSON safety. """
-    head = df.head(n).reset_index(drop=True)
+# Parsed uploads, keyed by (path, mtime_ns, size) so an overwritten file is never served stale.
+# Chained instructions re-read the same source repeatedly; callers must not mutate the cached frame.
+_DF_CACHE: "OrderedDict[tuple, tuple[pd.DataFrame, bool, int]]" = OrderedDict()
+_DF_CACHE_MAX_BYTES = 512 * 1024 * 1024
+_DF_CACHE_LOCK = threading.Lock()
+
+
+def _read_df_cached(path: str):
+    """ _read_df with an in-process LRU cache bounded by the frames' estimated memory. """
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    with _DF_CACHE_LOCK:
+        hit = _DF_CACHE.get(key)
+        if hit is not None:
+            _DF_CACHE.move_to_end(key)
+            return hit[0], hit[1]
+
+    df, is_excel = _read_df(path)
+    nbytes = int(df.memory_usage(deep=True).sum())
+    if nbytes <= _DF_CACHE_MAX_BYTES:
+        with _DF_CACHE_LOCK:
+            _DF_CACHE[key] = (df, is_excel, nbytes)
+            total = sum(v[2] for v in _DF_CACHE.values())
+            while total > _DF_CACHE_MAX_BYTES:
+                _, evicted = _DF_CACHE.popitem(last=False)
+                total -= evicted[2]
+    return df, is_excel
+
+
+def _is_int_or_text(s: pd.Series) -> bool:
+    """ True for integer and all-string columns, whose Arrow CSV reads back exactly like pandas' output. """
+    if s.dtype.kind in "iu" or str(s.dtype).startswith("string"):
+        return True
+    return s.dtype == object and pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty")
+
+
+def _write_csv(df: pd.DataFrame, fpath) -> None:
+    """ Write df as UTF-8 CSV with a BOM, through Arrow's C++ writer when the file reads back like pandas'. """
+    # Only int/string columns: Arrow formats floats, bools and datetimes differently from pandas,
+    # and exported files are re-read when chaining. (Arrow also quotes every string value; the
+    # bytes differ from to_csv, the parsed frame does not.)
+    if _HAS_PYARROW and df.columns.is_unique and all(isinstance(c, str) for c in df.columns) \
+            and all(_is_int_or_text(df[c]) for c in df.columns):
+        try:
+            tbl = pa.Table.from_pandas(df, preserve_index=False)
+            with pa.OSFile(str(fpath), "wb") as sink:
+                sink.write(b"\xef\xbb\xbf")
+                pacsv.write_csv(tbl, sink, write_options=pacsv.WriteOptions(quoting_style="needed"))
+            return
+        except Exception as e:  # mixed-type object columns etc.
+            log.debug("[CSV_ARROW_SKIP] %s", e)
 
-    # Replace NaN / NaT / ±Inf with None so JSON is valid
-    head = head.replace([pd.NA, pd.NaT, np.inf, -np.inf], None)
-    head = head.where(pd.notna(head), None)
+    # utf-8-sig makes it easier for Excel to open correctly
+    df.to_csv(fpath, index=False, encoding="utf-8-sig")
 
-    return head.to_dict(orient="records")
+
+def _head_records(df: pd.DataFrame, n=1000):
+    """ Return first n rows as list-of-dicts, with NaN/NaT/Inf replaced with None for JSON safety. """
+    return head_records(df, n)
 
 def sanitize_for_json(obj):
     """ Recursively sanitize an object for JSON serialization by replacing NaN/Inf with None. """
@@ -125,7 +188,16 @@ def sanitize_for_json(obj):
     if isinstance(obj, Mapping):
         return {k: sanitize_for_json(v) for k, v in obj.items()}
 
+    # Numeric arrays: one vectorized isfinite pass instead of a call per element
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind == "f":
+            return np.where(np.isfinite(obj), obj, None).tolist()
+        return sanitize_for_json(obj.tolist())
+
     if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes, bytearray)):
+        if all(type(v) in (int, float) for v in obj):
+            # Only floats can be NaN/Inf; math.isfinite overflows on ints beyond float range
+            return [None if type(v) is float and not math.isfinite(v) else v for v in obj]
         return [sanitize_for_json(v) for v in obj]
 
     return obj
@@ -140,7 +212,7 @@ def upload_file(request):
 
     obj = UploadedFile.objects.create(file=f, original_name=f.name)
     try:
-        df, is_excel = _read_df(obj.file.path)
+        df, is_excel = _read_df_cached(obj.file.path)
     except Exception as e:
         print(f"[FILE_READ_FAIL] failed to read uploaded file id={obj.id} name={obj.original_name}: {e}")
         # If reading fails, delete the uploadedFile record
@@ -181,7 +253,7 @@ def execute(request):
         return JsonResponse({"error": "instruction is required"}, status=400)
 
     obj = get_object_or_404(UploadedFile, id=file_id)
-    df, _ = _read_df(obj.file.path)
+    df, _ = _read_df_cached(obj.file.path)
 
     new_df, payload = nl_execute(
         df=df,
@@ -201,8 +273,7 @@ def execute(request):
         fname = f"{base_name}-{token}.csv"
         fpath = out_dir / fname
 
-        # utf-8-sig makes it easier for Excel to open correctly
-        df_to_export.to_csv(fpath, index=False, encoding="utf-8-sig")
+        _write_csv(df_to_export, fpath)
 
         rel_path = f"exports/{fname}"
         abs_url = request.build_absolute_uri(f"{media_url.rstrip('/')}/{rel_path}")